@@ -1,16 +1,88 @@
 """Knowledge Base Module - Loads JSON knowledge bases for skills."""
 
 import json
+import mmap
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; without it the JSON files are used
+    msgpack = None
 
 # Path to knowledge base directory
 KB_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Map category to JSON file
+CATEGORY_FILES = {
+    'fall': 'fall_base.json',
+    'electrical': 'electrical_base.json',
+    'struckby': 'struckby_base.json',
+    'general': 'general_base.json'
+}
+
+# Consolidated blob of all categories, built by knowledge_base/build_blob.py
+BLOB_FILE = os.path.join(KB_DIR, 'kb.msgpack')
+
+
+# Unpacked blob, tagged with the (mtime_ns, size) of the file it was read from
+_blob_cache: Optional[Tuple[Tuple[int, int], Dict[str, List[Dict[str, Any]]]]] = None
+
+
+def _load_blob() -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Load the consolidated msgpack blob, if present and up to date.
+
+    Freshness is checked against the JSON files on every call, since the
+    KB manager edits them in place; only the unpacked contents are memoized.
+
+    Returns:
+        Dictionary mapping category names to entries, or None if the blob
+        is unavailable or older than any of the JSON files
+    """
+    global _blob_cache
+
+    if msgpack is None or not os.path.exists(BLOB_FILE):
+        return None
+
+    blob_stat = os.stat(BLOB_FILE)
+    for filename in CATEGORY_FILES.values():
+        json_path = os.path.join(KB_DIR, filename)
+        if os.path.exists(json_path) and os.path.getmtime(json_path) > blob_stat.st_mtime:
+            return None
+
+    signature = (blob_stat.st_mtime_ns, blob_stat.st_size)
+    if _blob_cache is not None and _blob_cache[0] == signature:
+        return _blob_cache[1]
+
+    try:
+        with open(BLOB_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            blob = msgpack.unpackb(memoryview(mm))
+    except (ValueError, msgpack.UnpackException):
+        return None
+
+    _blob_cache = (signature, blob)
+    return blob
+
+
+# Parsed entries per category, tagged with the (mtime_ns, size) of the JSON
+# file they were read from
+_kb_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
 
 def load_knowledge_base(category: str) -> List[Dict[str, Any]]:
     """Load knowledge base entries for a specific category.
 
+    Results are memoized per category until the JSON file changes, so
+    repeated calls return the same list object. Callers must treat it as
+    read-only. Entries come from ``kb.msgpack`` when it exists and is newer
+    than the JSON files.
+
     Args:
         category: Category name ('fall', 'electrical', 'struckby', 'general')
 
@@ -21,24 +93,32 @@ def load_knowledge_base(category: str) -> List[Dict[str, Any]]:
         FileNotFoundError: If the knowledge base file doesn't exist
         JSONDecodeError: If the JSON file is malformed
     """
-    # Map category to JSON file
-    category_files = {
-        'fall': 'fall_base.json',
-        'electrical': 'electrical_base.json',
-        'struckby': 'struckby_base.json',
-        'general': 'general_base.json'
-    }
+    if category not in CATEGORY_FILES:
+        raise ValueError(f"Unknown category: {category}. Valid categories: {list(CATEGORY_FILES.keys())}")
 
-    if category not in category_files:
-        raise ValueError(f"Unknown category: {category}. Valid categories: {list(category_files.keys())}")
+    # Prefer the prebuilt blob when it is current
+    blob = _load_blob()
+    if blob is not None and category in blob:
+        return blob[category]
 
-    file_path = os.path.join(KB_DIR, category_files[category])
+    file_path = os.path.join(KB_DIR, CATEGORY_FILES[category])
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Knowledge base file not found: {file_path}")
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _kb_cache.get(category)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    # Read raw bytes: orjson parses them directly and json.loads accepts UTF-8 bytes
+    with open(file_path, 'rb') as f:
+        entries = _loads(f.read())
+
+    _kb_cache[category] = (signature, entries)
+    return entries
 
 
 def get_all_categories() -> List[str]:
@@ -47,7 +127,7 @@ def get_all_categories() -> List[str]:
     Returns:
         List of category names
     """
-    return ['fall', 'electrical', 'struckby', 'general']
+    return list(CATEGORY_FILES.keys())
 
 
 def get_kb_stats() -> Dict[str, int]:
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Build the consolidated knowledge base blob.
+
+Packs all category JSON files into a single ``kb.msgpack`` file that
+``load_knowledge_base`` memory-maps instead of parsing JSON. Re-run this
+after editing or importing into any ``*_base.json`` file; a stale blob is
+ignored automatically.
+
+Usage: python -m knowledge_base.build_blob
+"""
+
+import json
+import os
+
+import msgpack
+
+from knowledge_base import BLOB_FILE, CATEGORY_FILES, KB_DIR
+
+
+def build_blob(output_path: str = BLOB_FILE) -> int:
+    """Write all category knowledge bases to a single msgpack file.
+
+    Args:
+        output_path: Destination path for the blob
+
+    Returns:
+        Total number of entries written
+    """
+    data = {}
+    for category, filename in CATEGORY_FILES.items():
+        file_path = os.path.join(KB_DIR, filename)
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data[category] = json.load(f)
+
+    with open(output_path, 'wb') as f:
+        f.write(msgpack.packb(data, use_bin_type=True))
+
+    return sum(len(entries) for entries in data.values())
+
+
+def main():
+    total = build_blob()
+    print(f"💾 Wrote {total} entries to {BLOB_FILE}")
+
+
+if __name__ == '__main__':
+    main()
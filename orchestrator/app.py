@@ -12,6 +12,8 @@ from .llm_provider import ProviderType, get_provider_info
 class CorporateSafetyAgent:
     """Corporate Safety Agent powered by RAG and multiple AI providers."""
 
+    __slots__ = ('api_key', 'provider', 'model', 'graph')
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -25,13 +27,14 @@ class CorporateSafetyAgent:
             model: Model name (provider-specific, optional)
             provider: AI provider ("anthropic" or "openai")
         """
-        # Load environment variables
-        load_dotenv()
-
         # Get provider info
         provider_info = get_provider_info(provider)
         env_var = provider_info.get("env_var", "API_KEY")
 
+        # Load environment variables (skip the .env lookup if already set)
+        if env_var not in os.environ:
+            load_dotenv(override=False)
+
         # Get API key
         self.api_key = api_key or os.getenv(env_var)
         if not self.api_key:
@@ -78,16 +81,22 @@ class CorporateSafetyAgent:
 
     def interactive_mode(self):
         """Run the agent in interactive mode."""
-        print("=" * 70)
-        print("🛡️  CORPORATE SAFETY AGENT - Interactive Mode")
-        print("=" * 70)
-        print("\nAsk me about workplace safety!")
-        print("Topics: Fall hazards, Electrical safety, Struck-by hazards")
-        print("\nCommands:")
-        print("  - Type your question and press Enter")
-        print("  - Type 'quit' or 'exit' to end the session")
-        print("  - Type 'help' for example questions\n")
-        print("=" * 70 + "\n")
+        separator = "=" * 70
+        sys.stdout.write(f"""{separator}
+🛡️  CORPORATE SAFETY AGENT - Interactive Mode
+{separator}
+
+Ask me about workplace safety!
+Topics: Fall hazards, Electrical safety, Struck-by hazards
+
+Commands:
+  - Type your question and press Enter
+  - Type 'quit' or 'exit' to end the session
+  - Type 'help' for example questions
+
+{separator}
+
+""")
 
         while True:
             try:
@@ -140,22 +149,30 @@ class CorporateSafetyAgent:
 
     def _show_examples(self):
         """Show example questions."""
-        print("\n" + "=" * 70)
-        print("📋 EXAMPLE QUESTIONS")
-        print("=" * 70)
-        print("\n🪜 Fall Hazards:")
-        print("  - What safety equipment is needed for working at heights?")
-        print("  - How do I properly set up a ladder?")
-        print("  - What are the requirements for scaffolding?")
-        print("\n⚡ Electrical Hazards:")
-        print("  - What is lockout/tagout and when should it be used?")
-        print("  - How far should I stay from power lines?")
-        print("  - What PPE is required for electrical work?")
-        print("\n🚧 Struck-By Hazards:")
-        print("  - How can I prevent being hit by falling objects?")
-        print("  - What safety measures are needed around forklifts?")
-        print("  - How should materials be stacked safely?")
-        print("\n" + "=" * 70 + "\n")
+        separator = "=" * 70
+        sys.stdout.write(f"""
+{separator}
+📋 EXAMPLE QUESTIONS
+{separator}
+
+🪜 Fall Hazards:
+  - What safety equipment is needed for working at heights?
+  - How do I properly set up a ladder?
+  - What are the requirements for scaffolding?
+
+⚡ Electrical Hazards:
+  - What is lockout/tagout and when should it be used?
+  - How far should I stay from power lines?
+  - What PPE is required for electrical work?
+
+🚧 Struck-By Hazards:
+  - How can I prevent being hit by falling objects?
+  - What safety measures are needed around forklifts?
+  - How should materials be stacked safely?
+
+{separator}
+
+""")
 
 
 def main():
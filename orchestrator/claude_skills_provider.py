@@ -1,8 +1,58 @@
 """Claude Skills Provider - Integration with Claude Code managed skills."""
 
 import os
-from typing import Dict, Optional
-from anthropic import Anthropic
+import re
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+from anthropic import Anthropic, DefaultHttpxClient
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to substring scans
+    ahocorasick = None
+
+# Falls keywords
+_FALLS_KW = frozenset({
+    'fall', 'height', 'ladder', 'scaffold', 'roof', 'edge',
+    'guardrail', 'harness', 'wah', 'elevated', 'mewp', 'lift'
+})
+
+# Electrical keywords
+_ELECTRICAL_KW = frozenset({
+    'electric', 'shock', 'power', 'voltage', 'loto', 'lockout',
+    'energized', 'wire', 'cable', 'overhead line', 'arc flash', 'gfci'
+})
+
+# Struck-by keywords
+_STRUCKBY_KW = frozenset({
+    'struck', 'hit', 'vehicle', 'truck', 'forklift', 'crane',
+    'falling object', 'dropped', 'rigging', 'traffic', 'backing'
+})
+
+# No keyword can match a question shorter than this
+_MIN_KEYWORD_LEN = min(len(kw) for kw in _FALLS_KW | _ELECTRICAL_KW | _STRUCKBY_KW)
+
+# Connection pool shared by every provider instance
+_shared_http_client: Optional[DefaultHttpxClient] = None
+
+
+def _get_shared_http_client() -> DefaultHttpxClient:
+    """Get the process-wide HTTP client, creating it on first use.
+
+    Reusing one client keeps TCP/TLS connections alive across provider
+    instances. HTTP/2 is enabled when the optional h2 package is installed.
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        # DefaultHttpxClient applies the SDK's default timeout and connection limits
+        _shared_http_client = DefaultHttpxClient(http2=http2)
+    return _shared_http_client
 
 
 class ClaudeSkillsProvider:
@@ -13,6 +63,11 @@ class ClaudeSkillsProvider:
     prompt-based skill system for comparison.
     """
 
+    __slots__ = (
+        'api_key', 'client', '_skill_cache', '_response_cache',
+        '_keyword_automaton', '_keyword_patterns'
+    )
+
     # Map question types to Claude Code skills
     SKILL_MAPPING = {
         'falls': 'falls-safety',
@@ -25,6 +80,38 @@ class ClaudeSkillsProvider:
         'health': 'health-hazards'
     }
 
+    # Directory containing one <skill-name>/SKILL.md per skill
+    SKILLS_DIR = ".claude/skills"
+
+    # Model used for skill answers (Haiku for low latency/cost)
+    MODEL = "claude-3-5-haiku-latest"
+
+    # Stands in for $ARGUMENTS in the system prompt; the question itself is
+    # sent as the user message so the skill prompt can be cached
+    QUESTION_PLACEHOLDER = "(The user's question is provided in the user message.)"
+
+    # Routing keywords per classified skill, in tie-break order
+    CLASSIFY_KEYWORDS = {
+        'falls-safety': _FALLS_KW,
+        'electrical-safety': _ELECTRICAL_KW,
+        'struck-by-hazards': _STRUCKBY_KW
+    }
+
+    # Descriptions shown for available skills
+    SKILL_DESCRIPTIONS = {
+        'falls-safety': 'Expert in falls from heights, scaffolds, ladders, MEWPs, guardrails, and fall protection systems',
+        'electrical-safety': 'Expert in electrical hazards, LOTO procedures, overhead lines, temporary power, GFCI, and arc flash protection',
+        'struck-by-hazards': 'Expert in struck-by hazards including mobile equipment, traffic control, crane loads, falling objects, and backing vehicles',
+        'workplace-safety': 'Expert in general workplace safety including PPE, fire safety, hot work, demolition, housekeeping, and emergency response',
+        'confined-spaces': 'Expert in confined space entry requirements including atmospheric testing, entry permits, and rescue planning',
+        'cranes-hoisting': 'Expert in crane operations, hoisting safety, rigging, lift planning, and regulation updates',
+        'excavation-safety': 'Expert in excavation and trenching safety including soil classification, shoring, and cave-in prevention',
+        'health-hazards': 'Expert in construction health hazards including asbestos, silica, lead, noise, vibration, chemicals, and heat/cold stress'
+    }
+
+    # Maximum number of answers kept in the in-memory response cache
+    RESPONSE_CACHE_SIZE = 512
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the Claude Skills Provider.
 
@@ -35,21 +122,57 @@ class ClaudeSkillsProvider:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY is required for Claude Skills mode")
 
-        self.client = Anthropic(api_key=self.api_key)
-        self.skill_prompts = self._load_skill_prompts()
+        self.client = Anthropic(api_key=self.api_key, http_client=_get_shared_http_client())
+        self._skill_cache: Dict[str, Optional[str]] = {}  # Filled lazily by _get_skill_prompt
+        self._response_cache = OrderedDict()  # (skill, normalized question) -> result
+        self._keyword_automaton = self._build_keyword_automaton()
+        self._keyword_patterns = {
+            skill_name: re.compile(
+                r'\b(?:' + '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)) + ')'
+            )
+            for skill_name, keywords in self.CLASSIFY_KEYWORDS.items()
+        }
+
+    def _skill_file(self, skill_name: str) -> str:
+        """Get the path of a skill's SKILL.md file."""
+        return os.path.join(self.SKILLS_DIR, skill_name, "SKILL.md")
 
-    def _load_skill_prompts(self) -> Dict[str, str]:
-        """Load skill prompts from .claude/skills directory."""
-        prompts = {}
-        skills_dir = ".claude/skills"
+    def _get_skill_prompt(self, skill_name: str) -> Optional[str]:
+        """Load a skill's system prompt on first use.
 
-        for skill_name in self.SKILL_MAPPING.values():
-            skill_file = os.path.join(skills_dir, skill_name, "SKILL.md")
+        Args:
+            skill_name: Skill name (e.g., 'falls-safety')
+
+        Returns:
+            SKILL.md content with $ARGUMENTS replaced by QUESTION_PLACEHOLDER,
+            or None if the skill file doesn't exist
+        """
+        if skill_name not in self._skill_cache:
+            prompt = None
+            skill_file = self._skill_file(skill_name)
             if os.path.exists(skill_file):
                 with open(skill_file, 'r') as f:
-                    prompts[skill_name] = f.read()
+                    prompt = f.read().replace("$ARGUMENTS", self.QUESTION_PLACEHOLDER)
+            self._skill_cache[skill_name] = prompt
+
+        return self._skill_cache[skill_name]
 
-        return prompts
+    def _build_keyword_automaton(self):
+        """Build an Aho-Corasick automaton over all classification keywords.
+
+        Returns:
+            Automaton whose payloads are (skill, keyword), or None if
+            pyahocorasick is not installed
+        """
+        if ahocorasick is None:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for skill_name, keywords in self.CLASSIFY_KEYWORDS.items():
+            for kw in keywords:
+                automaton.add_word(kw, (skill_name, kw))
+        automaton.make_automaton()
+        return automaton
 
     def _classify_question(self, question: str) -> str:
         """Classify question to determine which skill to use.
@@ -60,40 +183,93 @@ class ClaudeSkillsProvider:
         Returns:
             Skill name (e.g., 'falls-safety', 'electrical-safety')
         """
+        if len(question) < _MIN_KEYWORD_LEN:
+            return 'workplace-safety'
+
         question_lower = question.lower()
 
-        # Falls keywords
-        falls_keywords = [
-            'fall', 'height', 'ladder', 'scaffold', 'roof', 'edge',
-            'guardrail', 'harness', 'wah', 'elevated', 'mewp', 'lift'
-        ]
-
-        # Electrical keywords
-        electrical_keywords = [
-            'electric', 'shock', 'power', 'voltage', 'loto', 'lockout',
-            'energized', 'wire', 'cable', 'overhead line', 'arc flash', 'gfci'
-        ]
-
-        # Struck-by keywords
-        struckby_keywords = [
-            'struck', 'hit', 'vehicle', 'truck', 'forklift', 'crane',
-            'falling object', 'dropped', 'rigging', 'traffic', 'backing'
-        ]
-
-        # Calculate scores
-        falls_score = sum(1 for kw in falls_keywords if kw in question_lower)
-        electrical_score = sum(1 for kw in electrical_keywords if kw in question_lower)
-        struckby_score = sum(1 for kw in struckby_keywords if kw in question_lower)
-
-        # Select highest scoring skill
-        if falls_score >= electrical_score and falls_score >= struckby_score and falls_score > 0:
-            return 'falls-safety'
-        elif electrical_score >= struckby_score and electrical_score > 0:
-            return 'electrical-safety'
-        elif struckby_score > 0:
-            return 'struck-by-hazards'
+        # Count distinct keyword hits per skill; keywords must start at a word
+        # boundary so e.g. "forklift" does not count as "lift"
+        scores = dict.fromkeys(self.CLASSIFY_KEYWORDS, 0)
+        if self._keyword_automaton is not None:
+            # Single pass over the question for all keywords
+            matched = set()
+            for end, (skill_name, kw) in self._keyword_automaton.iter(question_lower):
+                start = end - len(kw) + 1
+                if start == 0 or not (question_lower[start - 1].isalnum() or question_lower[start - 1] == '_'):
+                    matched.add((skill_name, kw))
+            for skill_name, _ in matched:
+                scores[skill_name] += 1
         else:
+            for skill_name, pattern in self._keyword_patterns.items():
+                scores[skill_name] = len(set(pattern.findall(question_lower)))
+
+        # Select highest scoring skill; ties go to the earlier entry in
+        # CLASSIFY_KEYWORDS (falls, electrical, struck-by)
+        score_values = tuple(scores.values())
+        best_score = max(score_values)
+        if best_score == 0:
             return 'workplace-safety'  # Default to general workplace safety
+        return tuple(scores)[score_values.index(best_score)]
+
+    def _stream_completion(self, skill_prompt: str, question: str) -> Iterator[str]:
+        """Stream an answer to a question using a skill's system prompt.
+
+        The skill prompt is marked for prompt caching, since it is identical
+        across every question routed to that skill.
+
+        Args:
+            skill_prompt: Skill system prompt from _get_skill_prompt
+            question: User's safety question
+
+        Yields:
+            Text chunks as they arrive from the API
+        """
+        with self.client.messages.stream(
+            model=self.MODEL,
+            max_tokens=2000,
+            temperature=0,
+            system=[{
+                "type": "text",
+                "text": skill_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }],
+            messages=[{
+                "role": "user",
+                "content": question
+            }]
+        ) as stream:
+            yield from stream.text_stream
+
+    def _get_cached_result(self, skill_name: str, question: str) -> Optional[Dict]:
+        """Look up a previous answer in the LRU cache."""
+        cache_key = (skill_name, question.strip().lower())
+        cached = self._response_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        self._response_cache.move_to_end(cache_key)
+        return {**cached, "query": question}
+
+    def _cache_result(self, question: str, skill_name: str, answer: str) -> Dict:
+        """Build a successful result and store it in the LRU cache.
+
+        Only successful answers are cached; errors are retried next time.
+        """
+        result = {
+            "query": question,
+            "answer": answer,
+            "skill": skill_name.replace('-', ' ').title(),
+            "mode": "claude-skills",
+            "sources": [f"Claude Code Skill: {skill_name}"],
+            "routed_to": skill_name
+        }
+
+        self._response_cache[(skill_name, question.strip().lower())] = result
+        if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+        return result
 
     def ask(self, question: str) -> Dict:
         """Ask a question using Claude Skills.
@@ -107,8 +283,13 @@ class ClaudeSkillsProvider:
         # Classify the question
         skill_name = self._classify_question(question)
 
+        # Serve repeated questions from the LRU cache
+        cached = self._get_cached_result(skill_name, question)
+        if cached is not None:
+            return cached
+
         # Get the skill prompt
-        skill_prompt = self.skill_prompts.get(skill_name)
+        skill_prompt = self._get_skill_prompt(skill_name)
         if not skill_prompt:
             return {
                 "query": question,
@@ -119,31 +300,10 @@ class ClaudeSkillsProvider:
                 "routed_to": skill_name
             }
 
-        # Replace $ARGUMENTS with the actual question
-        full_prompt = skill_prompt.replace("$ARGUMENTS", question)
-
         # Call Claude API with the skill prompt
         try:
-            response = self.client.messages.create(
-                model="claude-3-haiku-20240307",  # Use Haiku for low-latency/cost
-                max_tokens=2000,
-                temperature=0,
-                messages=[{
-                    "role": "user",
-                    "content": full_prompt
-                }]
-            )
-
-            answer = response.content[0].text
-
-            return {
-                "query": question,
-                "answer": answer,
-                "skill": skill_name.replace('-', ' ').title(),
-                "mode": "claude-skills",
-                "sources": [f"Claude Code Skill: {skill_name}"],
-                "routed_to": skill_name
-            }
+            answer = "".join(self._stream_completion(skill_prompt, question))
+            return self._cache_result(question, skill_name, answer)
 
         except Exception as e:
             return {
@@ -155,21 +315,42 @@ class ClaudeSkillsProvider:
                 "routed_to": skill_name
             }
 
+    def ask_stream(self, question: str) -> Iterator[str]:
+        """Ask a question using Claude Skills, streaming the answer.
+
+        The complete answer is cached like ask(), so a repeated question
+        yields its cached answer as a single chunk. API errors propagate
+        to the caller.
+
+        Args:
+            question: User's safety question
+
+        Yields:
+            Answer text chunks as they arrive
+        """
+        skill_name = self._classify_question(question)
+
+        cached = self._get_cached_result(skill_name, question)
+        if cached is not None:
+            yield cached["answer"]
+            return
+
+        skill_prompt = self._get_skill_prompt(skill_name)
+        if not skill_prompt:
+            yield f"Skill '{skill_name}' not found."
+            return
+
+        parts = []
+        for text in self._stream_completion(skill_prompt, question):
+            parts.append(text)
+            yield text
+
+        self._cache_result(question, skill_name, "".join(parts))
+
     def get_available_skills(self) -> Dict[str, str]:
         """Get list of available Claude Code skills.
 
         Returns:
             Dictionary mapping skill names to descriptions
         """
-        descriptions = {
-            'falls-safety': 'Expert in falls from heights, scaffolds, ladders, MEWPs, guardrails, and fall protection systems',
-            'electrical-safety': 'Expert in electrical hazards, LOTO procedures, overhead lines, temporary power, GFCI, and arc flash protection',
-            'struck-by-hazards': 'Expert in struck-by hazards including mobile equipment, traffic control, crane loads, falling objects, and backing vehicles',
-            'workplace-safety': 'Expert in general workplace safety including PPE, fire safety, hot work, demolition, housekeeping, and emergency response',
-            'confined-spaces': 'Expert in confined space entry requirements including atmospheric testing, entry permits, and rescue planning',
-            'cranes-hoisting': 'Expert in crane operations, hoisting safety, rigging, lift planning, and regulation updates',
-            'excavation-safety': 'Expert in excavation and trenching safety including soil classification, shoring, and cave-in prevention',
-            'health-hazards': 'Expert in construction health hazards including asbestos, silica, lead, noise, vibration, chemicals, and heat/cold stress'
-        }
-
-        return {k: v for k, v in descriptions.items() if k in self.skill_prompts}
+        return {k: v for k, v in self.SKILL_DESCRIPTIONS.items() if os.path.isfile(self._skill_file(k))}
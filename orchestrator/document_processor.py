@@ -1,9 +1,75 @@
 """Universal document processor supporting PDF, DOCX, DOC, TXT, and more."""
 
+import codecs
+import json
+import mmap
+import os
 import re
-from typing import List, Dict, Any
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from itertools import repeat
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF is optional; PDFs are read with PyPDF2 instead
+    pymupdf = None
+
+
+def _iter_mupdf_pages(pdf_path: str) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """Extract the text of every PDF page with PyMuPDF.
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Yields:
+        (page index, text, error) per page, as for ``_iter_pdf_page_range``
+    """
+    with pymupdf.open(pdf_path) as doc:
+        for page_num, page in enumerate(doc):
+            try:
+                text = page.get_text()
+                yield page_num, text if text.strip() else "", None
+            except Exception as e:
+                yield page_num, "", str(e)
+
+
+def _iter_pdf_page_range(pdf_path: str, start: int, stop: int) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """Extract the text of PDF pages ``start`` to ``stop - 1``.
+
+    Args:
+        pdf_path: Path to PDF file
+        start: Index of the first page
+        stop: Index one past the last page
+
+    Yields:
+        (page index, text, error) per page; text is empty for blank pages and
+        error is None unless extraction failed
+    """
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+
+        for page_num in range(start, stop):
+            try:
+                text = pages[page_num].extract_text()
+                yield page_num, text if text.strip() else "", None
+            except Exception as e:
+                yield page_num, "", str(e)
+
+
+def _extract_pdf_page_range(pdf_path: str, start: int, stop: int) -> List[Tuple[int, str, Optional[str]]]:
+    """Process-pool entry point: extract a page range into a list."""
+    return list(_iter_pdf_page_range(pdf_path, start, stop))
+
 
 class DocumentProcessor:
     """Process various document formats and extract clean content."""
@@ -28,17 +94,37 @@ class DocumentProcessor:
         r"^acknowledgments?$",
         r"^about the author$",
     ]
+    _UNWANTED_SECTION_RE = re.compile('|'.join(f'(?:{p})' for p in UNWANTED_SECTION_HEADERS), re.IGNORECASE)
 
-    # Unwanted phrases that appear in content (remove entire paragraph if found)
-    UNWANTED_PHRASES = [
+    # Unwanted phrases that appear in content (remove entire paragraph if found).
+    # Plain literals are checked with str operations on the lowercased paragraph;
+    # only the phrases that need real regex features go through the compiled pattern.
+    _UNWANTED_PREFIXES = (
         # Boilerplate/meta content
-        r"^copyright",
-        r"©",
-        r"all rights reserved",
-        r"^isbn",
-        r"published by",
-        r"publication date",
+        "copyright",
+        "isbn",
+    )
+    _UNWANTED_SUBSTRINGS = (
+        # Boilerplate/meta content
+        "©",
+        "all rights reserved",
+        "published by",
+        "publication date",
 
+        # Contact/promotional
+        "visit our website",
+        "www.",
+        "http://",
+        "https://",
+        "email:",
+        "contact us",
+        "@",  # Email addresses
+
+        # Legal
+        "trademark",
+        "disclaimer",
+    )
+    UNWANTED_PHRASES = [
         # Introductory fluff
         r"this (book|document|guide|manual|chapter) (will|shall|aims to|is designed to)",
         r"in this (chapter|section), (we|you) will",
@@ -46,18 +132,8 @@ class DocumentProcessor:
 
         # Contact/promotional
         r"for more information, (visit|see|contact)",
-        r"visit our website",
-        r"www\.",
-        r"http://",
-        r"https://",
-        r"email:",
-        r"contact us",
-        r"@",  # Email addresses
-
-        # Legal
-        r"trademark",
-        r"disclaimer",
     ]
+    _UNWANTED_PHRASE_RE = re.compile('|'.join(f'(?:{p})' for p in UNWANTED_PHRASES), re.IGNORECASE)
 
     # Page markers and headers/footers
     PAGE_MARKERS = [
@@ -71,21 +147,50 @@ class DocumentProcessor:
         r"^section \d+\.?\d*$",
         r"^\d+\.\d+$",  # Section numbers like "1.1"
     ]
+    _PAGE_MARKER_RE = re.compile('|'.join(f'(?:{p})' for p in PAGE_MARKERS), re.IGNORECASE)
+
+    # List item markers
+    _LIST_MARKER_RE = [
+        re.compile(r'^[\-\*\•]\s+'),  # Dash, asterisk, bullet
+        re.compile(r'^\d+[\.\)]\s+'),  # Numbered lists
+        re.compile(r'^[a-zA-Z][\.\)]\s+'),  # Lettered lists
+    ]
+
+    # Strong transitions or new topic indicators at the start of a paragraph
+    _TOPIC_CHANGE_RE = [
+        re.compile(r'^(however|meanwhile|in contrast|on the other hand|alternatively)', re.IGNORECASE),
+        re.compile(r'^(step \d+|phase \d+|part \d+)', re.IGNORECASE),
+        re.compile(r'^(important|note|warning|caution|remember)', re.IGNORECASE),
+    ]
+
+    # Section header patterns
+    _NUMBERED_SECTION_RE = re.compile(r'^(chapter\s+)?\d+[\.:]\s+[A-Z]', re.IGNORECASE)
+    _SUBSECTION_RE = re.compile(r'^\d+\.\d+\s+[A-Z]')
+    _CAPS_WORD_RE = re.compile(r'\b[A-Z]{2,}\b')
+
+    # Page-level parallelism for PDF extraction: each worker process re-opens
+    # the PDF, so only split when every worker gets at least this many pages
+    PDF_PAGES_PER_WORKER = 25
+
+    # Translation table that deletes ASCII letters (for counting alphabetic chars)
+    _DELETE_ASCII_LETTERS = str.maketrans('', '', string.ascii_letters)
+
+    # Whitespace normalization in one pass: 3+ newlines -> 2, 2+ spaces -> 1.
+    # Only the matching branch's group is set, so r'\1\1\2' yields either
+    # "\n\n" or " " without a Python callback.
+    _EXCESS_WHITESPACE_RE = re.compile(r'(\n)\n\n+|( ) +')
 
     def __init__(self):
         """Initialize the document processor."""
         self.min_chunk_size = 200  # Smaller for more granular chunks
         self.max_chunk_size = 800  # Much smaller for focused content
         self.target_chunk_size = 500  # Ideal chunk size
-        self._kb_manager = None  # Lazy initialization
 
-    @property
+    @cached_property
     def kb_manager(self):
-        """Lazy-load the knowledge base manager."""
-        if self._kb_manager is None:
-            from orchestrator.knowledge_base_manager import KnowledgeBaseManager
-            self._kb_manager = KnowledgeBaseManager()
-        return self._kb_manager
+        """Lazy-load the shared knowledge base manager."""
+        from orchestrator.knowledge_base_manager import get_knowledge_base_manager
+        return get_knowledge_base_manager()
 
     def extract_text_from_file(self, file_path: str) -> str:
         """Extract text from various file formats.
@@ -113,28 +218,55 @@ class DocumentProcessor:
 
     def _extract_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF file."""
+        return "\n\n".join(self._iter_pdf_pages(pdf_path))
+
+    def _iter_pdf_pages(self, pdf_path: str) -> Iterator[str]:
+        """Yield the text of each non-empty PDF page as it is extracted.
+
+        PyMuPDF is used when installed. Otherwise PyPDF2 extracts the pages,
+        splitting large PDFs into contiguous page ranges that are extracted in
+        worker processes; pages are still yielded in document order.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Yields:
+            Text of one page; pages without text are skipped
+        """
+        if pymupdf is not None:
+            yield from self._page_texts(_iter_mupdf_pages(pdf_path))
+            return
+
         try:
             import PyPDF2
         except ImportError:
             raise ImportError(
                 "PyPDF2 is required for PDF processing. "
-                "Install it with: pip install PyPDF2"
+                "Install it with: pip install PyPDF2 (or pymupdf for faster extraction)"
             )
 
-        text_content = []
-
         with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    text = page.extract_text()
-                    if text.strip():
-                        text_content.append(text)
-                except Exception as e:
-                    print(f"⚠️ Could not extract text from page {page_num + 1}: {e}")
+            num_pages = len(PyPDF2.PdfReader(file).pages)
+
+        workers = min(os.cpu_count() or 1, num_pages // self.PDF_PAGES_PER_WORKER)
+        if workers > 1:
+            step = -(-num_pages // workers)  # ceil division
+            starts = range(0, num_pages, step)
+            stops = [min(start + step, num_pages) for start in starts]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                page_batches = executor.map(_extract_pdf_page_range, repeat(pdf_path), starts, stops)
+                pages = (page for batch in page_batches for page in batch)
+                yield from self._page_texts(pages)
+        else:
+            yield from self._page_texts(_iter_pdf_page_range(pdf_path, 0, num_pages))
 
-        return "\n\n".join(text_content)
+    def _page_texts(self, pages: Iterator[Tuple[int, str, Optional[str]]]) -> Iterator[str]:
+        """Report failed pages and yield the text of non-empty ones."""
+        for page_num, text, error in pages:
+            if error is not None:
+                print(f"⚠️ Could not extract text from page {page_num + 1}: {error}")
+            elif text:
+                yield text
 
     def _extract_from_word(self, word_path: str) -> str:
         """Extract text from Word documents (DOCX/DOC)."""
@@ -171,9 +303,21 @@ class DocumentProcessor:
             raise ValueError(f"Error reading Word document: {e}")
 
     def _extract_from_txt(self, txt_path: str) -> str:
-        """Extract text from TXT file."""
-        with open(txt_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        """Extract text from TXT file.
+
+        The file is memory-mapped and decoded straight from the mapping, so the
+        raw bytes are never copied into an intermediate Python buffer.
+        """
+        if os.path.getsize(txt_path) == 0:
+            return ""
+
+        with open(txt_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text, _ = codecs.utf_8_decode(mm, 'ignore', True)
+
+        # Match text-mode reading: universal newlines
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
 
     def clean_text(self, text: str) -> str:
         """Clean extracted text by aggressively removing unwanted sections.
@@ -186,11 +330,16 @@ class DocumentProcessor:
         """
         original_length = len(text)
 
-        # Step 1: Remove entire unwanted sections
-        text = self._remove_unwanted_sections(text)
+        # Split once and carry (original, stripped, lowercased) through the
+        # paragraph filter so each paragraph is stripped/lowered only once
+        paragraphs = []
+        for para in text.split('\n\n'):
+            para_stripped = para.strip()
+            paragraphs.append((para, para_stripped, para_stripped.lower()))
 
-        # Step 2: Filter paragraphs to remove unwanted content
-        text = self._filter_paragraphs(text)
+        # Steps 1-2: Remove entire unwanted sections and filter paragraphs
+        # to remove unwanted content
+        text = '\n\n'.join(self._filter_all(paragraphs))
 
         # Step 3: Remove page markers and headers/footers
         text = self._remove_page_markers(text)
@@ -199,8 +348,7 @@ class DocumentProcessor:
         text = self._remove_repeated_content(text)
 
         # Step 5: Clean up whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
+        text = self._EXCESS_WHITESPACE_RE.sub(r'\1\1\2', text)
         text = text.strip()
 
         cleaned_length = len(text)
@@ -209,80 +357,64 @@ class DocumentProcessor:
 
         return text
 
-    def _remove_unwanted_sections(self, text: str) -> str:
-        """Remove entire sections that are not useful (TOC, references, etc.)."""
-        # Split into paragraphs to work paragraph-by-paragraph
-        paragraphs = text.split('\n\n')
+    def _filter_all(self, paragraphs: List[Tuple[str, str, str]]) -> List[str]:
+        """Drop unwanted sections and paragraphs in a single pass.
+
+        Removes entire sections that are not useful (TOC, references, etc.)
+        and filters out paragraphs containing unwanted phrases or formatting
+        artifacts.
+
+        Args:
+            paragraphs: (original, stripped, lowercased) paragraph tuples
+
+        Returns:
+            The original text of the paragraphs that were kept
+        """
         kept_paragraphs = []
         skip_until_next_section = False
 
-        for para in paragraphs:
-            para_lower = para.strip().lower()
-
+        for para, para_stripped, para_lower in paragraphs:
             # Check if this paragraph is an unwanted section header
-            is_unwanted_section = False
-            for pattern in self.UNWANTED_SECTION_HEADERS:
-                if re.match(pattern, para_lower, re.IGNORECASE):
-                    is_unwanted_section = True
-                    skip_until_next_section = True
-                    break
-
-            if is_unwanted_section:
+            if self._UNWANTED_SECTION_RE.match(para_lower):
+                skip_until_next_section = True
                 continue
 
             # If we're skipping, check if we hit a new major section (to stop skipping)
+            is_header = False
             if skip_until_next_section:
                 # Check if this is a major content section (all caps, or chapter heading)
-                if (self._is_section_header(para) and
-                    not any(re.match(p, para_lower, re.IGNORECASE) for p in self.UNWANTED_SECTION_HEADERS)):
-                    # This is a real content section, stop skipping
-                    skip_until_next_section = False
-                    kept_paragraphs.append(para)
-                # Otherwise continue skipping
-                continue
-
-            # Keep this paragraph
-            kept_paragraphs.append(para)
-
-        return '\n\n'.join(kept_paragraphs)
-
-    def _filter_paragraphs(self, text: str) -> str:
-        """Filter out paragraphs containing unwanted phrases."""
-        paragraphs = text.split('\n\n')
-        filtered_paragraphs = []
-
-        for para in paragraphs:
-            para_lower = para.lower()
-            para_stripped = para.strip()
-
-            # Skip if contains unwanted phrases
-            contains_unwanted = False
-            for phrase_pattern in self.UNWANTED_PHRASES:
-                if re.search(phrase_pattern, para_lower, re.IGNORECASE):
-                    contains_unwanted = True
-                    break
-
-            if contains_unwanted:
+                if not self._is_section_header(para_stripped):
+                    continue
+                # This is a real content section, stop skipping
+                skip_until_next_section = False
+                is_header = True
+
+            # Cheapest tests first, the phrase regex last.
+            # Skip very short paragraphs (likely formatting artifacts),
+            # but keep section headers even if short
+            is_short = len(para_stripped) < 15
+            if is_short and not (is_header or self._is_section_header(para_stripped)):
                 continue
 
-            # Keep section headers even if short
-            if self._is_section_header(para_stripped):
-                filtered_paragraphs.append(para)
+            # Skip if contains unwanted literal phrases
+            # Prefixes only count at the very start of the raw paragraph
+            if ((para_lower.startswith(self._UNWANTED_PREFIXES) and not para[:1].isspace()) or
+                    any(s in para_lower for s in self._UNWANTED_SUBSTRINGS)):
                 continue
 
-            # Skip very short paragraphs (likely formatting artifacts)
-            if len(para_stripped) < 15:
+            # Skip if mostly punctuation or numbers (section headers are kept)
+            # Be less strict - only remove if less than 30% alphabetic
+            if (not is_short and len(para) > 30 and self._count_alpha(para) < len(para) * 0.3 and
+                    not (is_header or self._is_section_header(para_stripped))):
                 continue
 
-            # Skip if mostly punctuation or numbers
-            # Be less strict - only remove if less than 30% alphabetic
-            alpha_chars = sum(c.isalpha() for c in para)
-            if len(para) > 30 and alpha_chars < len(para) * 0.3:
+            # Skip if contains unwanted phrases
+            if self._UNWANTED_PHRASE_RE.search(para_lower):
                 continue
 
-            filtered_paragraphs.append(para)
+            kept_paragraphs.append(para)
 
-        return '\n\n'.join(filtered_paragraphs)
+        return kept_paragraphs
 
     def _remove_page_markers(self, text: str) -> str:
         """Remove page numbers and headers/footers while preserving paragraph breaks."""
@@ -290,29 +422,70 @@ class DocumentProcessor:
         cleaned_lines = []
 
         for line in lines:
-            line_lower = line.lower().strip()
+            line_stripped = line.strip()
 
             # Preserve empty lines (they're paragraph separators!)
-            if not line.strip():
+            if not line_stripped:
                 cleaned_lines.append(line)
                 continue
 
             # Skip page markers
-            if any(re.match(pattern, line_lower, re.IGNORECASE) for pattern in self.PAGE_MARKERS):
+            if self._PAGE_MARKER_RE.match(line_stripped.lower()):
                 continue
 
             # Skip very short lines (likely headers/footers) but not empty lines
-            if len(line.strip()) < 10:
+            if len(line_stripped) < 10:
                 continue
 
             # Skip lines that are just repeated characters (decorative lines)
-            if line.strip() and len(set(line.strip())) <= 3:  # Like "========" or "--------"
+            if self._is_decorative_line(line_stripped):  # Like "========" or "--------"
                 continue
 
             cleaned_lines.append(line)
 
         return '\n'.join(cleaned_lines)
 
+    def _count_alpha(self, text: str) -> int:
+        """Count alphabetic characters, matching ``str.isalpha``.
+
+        ASCII letters are removed with a C-level ``str.translate``; only the
+        non-letter remainder is scanned in Python, and only if it contains
+        non-ASCII characters that could still be letters.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of alphabetic characters in the text
+        """
+        rest = text.translate(self._DELETE_ASCII_LETTERS)
+        alpha_chars = len(text) - len(rest)
+        if not rest.isascii():
+            alpha_chars += sum(c.isalpha() for c in rest)
+        return alpha_chars
+
+    def _is_decorative_line(self, text: str, max_distinct: int = 3) -> bool:
+        """Check if a line uses only a handful of distinct characters.
+
+        Stops at the first character past ``max_distinct``, so ordinary text
+        lines are rejected after a few characters instead of building a set
+        of every character in the line.
+
+        Args:
+            text: Stripped line to check
+            max_distinct: Most distinct characters a decorative line may use
+
+        Returns:
+            True if the line has at most ``max_distinct`` distinct characters
+        """
+        seen = set()
+        for char in text:
+            if char not in seen:
+                if len(seen) == max_distinct:
+                    return False
+                seen.add(char)
+        return True
+
     def _remove_repeated_content(self, text: str) -> str:
         """Remove repeated sentences or paragraphs."""
         paragraphs = text.split('\n\n')
@@ -321,15 +494,18 @@ class DocumentProcessor:
 
         for para in paragraphs:
             para_clean = para.strip().lower()
+            # Track hashes rather than the lowercased copies to keep memory per
+            # paragraph constant; a 64-bit collision within one document is negligible
+            para_hash = hash(para_clean)
 
-            if para_clean in seen:
+            if para_hash in seen:
                 continue
 
             if len(para_clean) < 30:
                 unique_paragraphs.append(para)
                 continue
 
-            seen.add(para_clean)
+            seen.add(para_hash)
             unique_paragraphs.append(para)
 
         return '\n\n'.join(unique_paragraphs)
@@ -348,55 +524,61 @@ class DocumentProcessor:
         """
         paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
 
+        # Classify each paragraph once, and pair every paragraph with the next
+        # one's values (None/False past the end) so the look-ahead is a plain read
+        is_header = [self._is_section_header(p) for p in paragraphs]
+        is_list = [self._is_list_item(p) for p in paragraphs]
+        lookahead = zip(
+            paragraphs, is_header, is_list,
+            paragraphs[1:] + [None], is_header[1:] + [False], is_list[1:] + [False],
+        )
+
         chunks = []
-        current_chunk = ""
+        # Paragraphs of the chunk being built and the length of their "\n\n" join
+        current_parts = []
+        current_len = 0
         current_title = "Safety Information"
         chunk_counter = 0
 
-        for i, para in enumerate(paragraphs):
+        for para, para_is_header, is_list_item, next_para, next_is_header, next_is_list in lookahead:
             # Check if this is a section header
-            if self._is_section_header(para):
+            if para_is_header:
                 # ALWAYS split at section headers
-                if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size * 0.5:
+                if current_parts and current_len >= self.min_chunk_size * 0.5:
                     chunks.append({
                         "title": current_title,
-                        "content": current_chunk.strip(),
+                        "content": "\n\n".join(current_parts),
                         "category": category
                     })
                     chunk_counter += 1
-                    current_chunk = ""
+                    current_parts = []
+                    current_len = 0
 
                 # Start new section with this header as title
                 current_title = para[:100].strip()
                 continue
 
-            # Detect if we're starting a bulleted list
-            is_list_item = self._is_list_item(para)
-            next_is_list = False
-            if i + 1 < len(paragraphs):
-                next_is_list = self._is_list_item(paragraphs[i + 1])
-
             # Add paragraph to current chunk
-            if current_chunk:
-                current_chunk += "\n\n"
-            current_chunk += para
+            if current_parts:
+                current_len += 2
+            current_parts.append(para)
+            current_len += len(para)
 
             # Aggressive splitting logic
             should_split = False
 
             # ALWAYS split if we exceed max size
-            if len(current_chunk) >= self.max_chunk_size:
+            if current_len >= self.max_chunk_size:
                 should_split = True
 
             # Split at target size if we're at a good break point
-            elif len(current_chunk) >= self.target_chunk_size:
+            elif current_len >= self.target_chunk_size:
                 # Split if:
                 # 1. Next paragraph is a section header
                 # 2. Next paragraph is not a list item (don't split lists)
                 # 3. Current paragraph is not a list item, or list just ended
-                if i + 1 < len(paragraphs):
-                    next_para = paragraphs[i + 1]
-                    if self._is_section_header(next_para):
+                if next_para is not None:
+                    if next_is_header:
                         should_split = True
                     elif not next_is_list and not is_list_item:
                         should_split = True
@@ -405,10 +587,9 @@ class DocumentProcessor:
                         should_split = True
 
             # Also split at min size if we detect topic change
-            elif len(current_chunk) >= self.min_chunk_size:
-                if i + 1 < len(paragraphs):
-                    next_para = paragraphs[i + 1]
-                    if self._is_section_header(next_para):
+            elif current_len >= self.min_chunk_size:
+                if next_para is not None:
+                    if next_is_header:
                         should_split = True
                     elif self._is_topic_change(para, next_para) and not is_list_item:
                         should_split = True
@@ -416,17 +597,18 @@ class DocumentProcessor:
             if should_split:
                 chunks.append({
                     "title": current_title,
-                    "content": current_chunk.strip(),
+                    "content": "\n\n".join(current_parts),
                     "category": category
                 })
                 chunk_counter += 1
-                current_chunk = ""
+                current_parts = []
+                current_len = 0
 
         # Add final chunk (be lenient with size)
-        if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size * 0.4:
+        if current_parts and current_len >= self.min_chunk_size * 0.4:
             chunks.append({
                 "title": current_title,
-                "content": current_chunk.strip(),
+                "content": "\n\n".join(current_parts),
                 "category": category
             })
             chunk_counter += 1
@@ -456,29 +638,32 @@ class DocumentProcessor:
 
             # Split large chunk by paragraphs
             paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-            sub_chunk = ""
+            sub_parts = []
+            sub_len = 0
             part_num = 1
 
             for para in paragraphs:
-                if sub_chunk:
-                    sub_chunk += "\n\n"
-                sub_chunk += para
+                if sub_parts:
+                    sub_len += 2
+                sub_parts.append(para)
+                sub_len += len(para)
 
                 # Split when we reach a good size
-                if len(sub_chunk) >= self.target_chunk_size:
+                if sub_len >= self.target_chunk_size:
                     new_chunks.append({
                         "title": f"{title} (Part {part_num})" if part_num > 1 else title,
-                        "content": sub_chunk.strip(),
+                        "content": "\n\n".join(sub_parts),
                         "category": category
                     })
                     part_num += 1
-                    sub_chunk = ""
+                    sub_parts = []
+                    sub_len = 0
 
             # Add remaining content
-            if sub_chunk.strip():
+            if sub_parts:
                 new_chunks.append({
                     "title": f"{title} (Part {part_num})" if part_num > 1 else title,
-                    "content": sub_chunk.strip(),
+                    "content": "\n\n".join(sub_parts),
                     "category": category
                 })
 
@@ -495,14 +680,9 @@ class DocumentProcessor:
             True if looks like a list item
         """
         # Check for common list markers
-        list_markers = [
-            r'^[\-\*\•]\s+',  # Dash, asterisk, bullet
-            r'^\d+[\.\)]\s+',  # Numbered lists
-            r'^[a-zA-Z][\.\)]\s+',  # Lettered lists
-        ]
-
-        for pattern in list_markers:
-            if re.match(pattern, text.strip()):
+        text_stripped = text.strip()
+        for pattern in self._LIST_MARKER_RE:
+            if pattern.match(text_stripped):
                 return True
 
         return False
@@ -518,15 +698,9 @@ class DocumentProcessor:
             True if appears to be a topic change
         """
         # If next paragraph starts with a strong transition or new topic indicator
-        topic_change_indicators = [
-            r'^(however|meanwhile|in contrast|on the other hand|alternatively)',
-            r'^(step \d+|phase \d+|part \d+)',
-            r'^(important|note|warning|caution|remember)',
-        ]
-
         next_lower = next_para.lower().strip()
-        for pattern in topic_change_indicators:
-            if re.match(pattern, next_lower, re.IGNORECASE):
+        for pattern in self._TOPIC_CHANGE_RE:
+            if pattern.match(next_lower):
                 return True
 
         return False
@@ -534,30 +708,34 @@ class DocumentProcessor:
     def _is_section_header(self, text: str) -> bool:
         """Check if text looks like a section header (improved detection)."""
         text_stripped = text.strip()
+        is_short = len(text_stripped) < 100
 
-        # Short and all uppercase (like "FALL PROTECTION")
-        if len(text_stripped) < 100 and text_stripped.isupper() and len(text_stripped) > 5:
-            return True
-
-        # Numbered sections (like "1. Introduction" or "Chapter 1:")
-        if re.match(r'^(chapter\s+)?\d+[\.:]\s+[A-Z]', text_stripped, re.IGNORECASE):
-            return True
-
-        # Section numbers (like "1.1 Safety Procedures")
-        if re.match(r'^\d+\.\d+\s+[A-Z]', text_stripped):
-            return True
+        # Cheap string tests first; the regexes only run when they can match
+        if is_short:
+            # Short and all uppercase (like "FALL PROTECTION")
+            if len(text_stripped) > 5 and text_stripped.isupper():
+                return True
 
-        # Multiple capitalized words (like "Fall Protection Equipment")
-        if len(text_stripped) < 100:
-            words = text_stripped.split()
-            if len(words) >= 2 and len(words) <= 8:
-                capitalized_words = sum(1 for w in words if w and w[0].isupper())
-                if capitalized_words == len(words) and not text_stripped.endswith('.'):
+            # Multiple capitalized words (like "Fall Protection Equipment")
+            if not text_stripped.endswith('.'):
+                words = text_stripped.split()
+                if 2 <= len(words) <= 8 and all(w[0].isupper() for w in words):
                     return True
 
-        # Contains multiple all-caps words (like "OSHA FALL PROTECTION")
-        if len(text_stripped) < 100 and len(re.findall(r'\b[A-Z]{2,}\b', text_stripped)) >= 2:
-            return True
+        # Numbered sections (like "1. Introduction" or "Chapter 1:") and
+        # section numbers (like "1.1 Safety Procedures") start with a digit or "chapter"
+        if text_stripped[:1].isdigit() or text_stripped[:7].lower() == 'chapter':
+            if self._NUMBERED_SECTION_RE.match(text_stripped):
+                return True
+            if self._SUBSECTION_RE.match(text_stripped):
+                return True
+
+        # Contains multiple all-caps words (like "OSHA FALL PROTECTION");
+        # stop scanning at the second one
+        if is_short:
+            caps_words = self._CAPS_WORD_RE.finditer(text_stripped)
+            if next(caps_words, None) and next(caps_words, None):
+                return True
 
         return False
 
@@ -585,19 +763,21 @@ class DocumentProcessor:
         return chunks
 
     def save_chunks_to_file(self, chunks: List[Dict[str, Any]], output_path: str):
-        """Save processed chunks to a Python file."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# Auto-generated knowledge base from document\n\n")
-            f.write("KNOWLEDGE_BASE = [\n")
-
-            for chunk in chunks:
-                f.write("    {\n")
-                f.write(f'        "title": """{chunk["title"]}""",\n')
-                f.write(f'        "content": """{chunk["content"]}""",\n')
-                f.write(f'        "category": "{chunk["category"]}"\n')
-                f.write("    },\n")
-
-            f.write("]\n")
+        """Save processed chunks to a JSON file.
+
+        The file uses the same list-of-entries layout as the knowledge base
+        JSON files, so it can be loaded or merged like any ``*_base.json``.
+
+        Args:
+            chunks: List of document chunks to save
+            output_path: Path of the JSON file to write
+        """
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(chunks, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(chunks, f, indent=2, ensure_ascii=False)
 
         print(f"💾 Saved to: {output_path}")
 
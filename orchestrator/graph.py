@@ -1,5 +1,6 @@
 """LangGraph orchestration for the corporate safety agent."""
 
+import asyncio
 from typing import TypedDict, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import StateGraph, END
@@ -39,7 +40,8 @@ class SafetyAgentGraph:
         self,
         api_key: str,
         model: Optional[str] = None,
-        provider: ProviderType = "anthropic"
+        provider: ProviderType = "anthropic",
+        speculative_routing: bool = True
     ):
         """Initialize the safety agent graph.
 
@@ -47,9 +49,13 @@ class SafetyAgentGraph:
             api_key: API key for the provider
             model: Model name (provider-specific, optional)
             provider: AI provider ("anthropic" or "openai")
+            speculative_routing: Start routing while the question filter runs,
+                saving one LLM round trip for safety questions at the cost of a
+                wasted routing call for rejected ones
         """
         # Initialize LLM with provider
         self.provider = provider
+        self.speculative_routing = speculative_routing
         self.llm = get_llm(
             provider=provider,
             model=model,
@@ -65,10 +71,33 @@ class SafetyAgentGraph:
         self.struckby_skill = StruckByHazardSkill(self.llm)
         self.general_skill = GeneralSafetySkill(self.llm)
 
+        # Skills by route name
+        self._skills = {
+            "fall": self.fall_skill,
+            "electrical": self.electrical_skill,
+            "struckby": self.struckby_skill,
+            "general": self.general_skill
+        }
+
+        # Prompt chain for queries that don't fit a specific skill
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a corporate safety assistant. You help answer workplace safety questions.
+
+If the question is about a specific hazard type (falls, electrical, struck-by), provide general guidance
+and suggest the user ask more specific questions.
+
+If the question is general or covers multiple hazard types, provide comprehensive safety advice.
+
+Always prioritize worker safety and OSHA compliance in your responses."""),
+            ("human", "{query}")
+        ])
+
+        self._general_chain = prompt | self.llm
+
         # Build the graph
         self.graph = self._build_graph()
 
-    def _route_query(self, state: AgentState) -> AgentState:
+    async def _route_query(self, state: AgentState) -> AgentState:
         """Route the query to the appropriate skill.
 
         Args:
@@ -77,14 +106,22 @@ class SafetyAgentGraph:
         Returns:
             Updated state with routed_skill
         """
-        import asyncio
-
         query = state["query"]
 
+        # Routing doesn't depend on the filter result, so optionally start it now
+        router_task = asyncio.create_task(self.router.route(query)) if self.speculative_routing else None
+
         # First, filter the question to ensure it's safety-related
-        is_safety, category = self.question_filter.is_safety_related(query)
+        try:
+            is_safety, category = await self.question_filter.is_safety_related_async(query)
+        except BaseException:
+            if router_task is not None:
+                router_task.cancel()
+            raise
 
         if not is_safety:
+            if router_task is not None:
+                router_task.cancel()
             # Non-safety question, mark for rejection
             return {
                 **state,
@@ -93,14 +130,17 @@ class SafetyAgentGraph:
             }
 
         # Get routing decision for safety questions
-        routed_skill = asyncio.run(self.router.route(query))
+        if router_task is not None:
+            routed_skill = await router_task
+        else:
+            routed_skill = await self.router.route(query)
 
         return {
             **state,
             "routed_skill": routed_skill
         }
 
-    def _process_with_skill(self, state: AgentState) -> AgentState:
+    async def _process_with_skill(self, state: AgentState) -> AgentState:
         """Process the query with the appropriate skill.
 
         Args:
@@ -109,8 +149,6 @@ class SafetyAgentGraph:
         Returns:
             Updated state with answer and metadata
         """
-        import asyncio
-
         query = state["query"]
         routed_skill = state["routed_skill"]
 
@@ -127,21 +165,11 @@ class SafetyAgentGraph:
             }
 
         try:
-            # Select the appropriate skill
-            if routed_skill == "fall":
-                skill = self.fall_skill
-            elif routed_skill == "electrical":
-                skill = self.electrical_skill
-            elif routed_skill == "struckby":
-                skill = self.struckby_skill
-            elif routed_skill == "general":
-                skill = self.general_skill
-            else:
-                # Fallback to general skill for unrecognized routes
-                skill = self.general_skill
+            # Select the appropriate skill, falling back to general for unrecognized routes
+            skill = self._skills.get(routed_skill, self.general_skill)
 
             # Process with the skill
-            result = asyncio.run(skill.process(query))
+            result = await skill.process(query)
 
             return {
                 **state,
@@ -160,7 +188,7 @@ class SafetyAgentGraph:
                 "error": str(e)
             }
 
-    def _handle_general_query(self, state: AgentState) -> AgentState:
+    async def _handle_general_query(self, state: AgentState) -> AgentState:
         """Handle general queries that don't fit a specific skill.
 
         Args:
@@ -169,27 +197,10 @@ class SafetyAgentGraph:
         Returns:
             Updated state with answer
         """
-        import asyncio
-
         query = state["query"]
 
-        # Create a general safety prompt
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a corporate safety assistant. You help answer workplace safety questions.
-
-If the question is about a specific hazard type (falls, electrical, struck-by), provide general guidance
-and suggest the user ask more specific questions.
-
-If the question is general or covers multiple hazard types, provide comprehensive safety advice.
-
-Always prioritize worker safety and OSHA compliance in your responses."""),
-            ("human", "{query}")
-        ])
-
-        chain = prompt | self.llm
-
         try:
-            response = asyncio.run(chain.ainvoke({"query": query}))
+            response = await self._general_chain.ainvoke({"query": query})
 
             return {
                 **state,
@@ -268,5 +279,4 @@ Always prioritize worker safety and OSHA compliance in your responses."""),
         Returns:
             Dictionary with answer and metadata
         """
-        import asyncio
         return asyncio.run(self.process_query(query))
@@ -2,10 +2,129 @@
 
 import json
 import hashlib
+import math
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _iter_json_array(text: str) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time.
+
+    Only the current element is held as Python objects, instead of the
+    whole decoded list.
+
+    Raises:
+        json.JSONDecodeError: If the text isn't a JSON array
+    """
+    pos = _JSON_WHITESPACE.match(text, 0).end()
+    if text[pos:pos + 1] != '[':
+        raise json.JSONDecodeError("Expecting '['", text, pos)
+
+    pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+    if text[pos:pos + 1] == ']':
+        return
+
+    while True:
+        item, pos = _JSON_DECODER.raw_decode(text, pos)
+        yield item
+
+        pos = _JSON_WHITESPACE.match(text, pos).end()
+        delimiter = text[pos:pos + 1]
+        if delimiter == ']':
+            return
+        if delimiter != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Split text into the lowercase word set used for similarity."""
+    return set(text.lower().strip().split())
+
+
+def _jaccard(words1: Set[str], words2: Set[str], threshold: float = 0.0) -> float:
+    """Jaccard similarity (intersection / union) of two word sets.
+
+    The similarity can't exceed smaller size / larger size, so pairs whose
+    sizes rule out reaching threshold return 0.0 without intersecting.
+    """
+    if not words1 or not words2:
+        return 0.0
+
+    size1, size2 = len(words1), len(words2)
+    if (size1 / size2 if size1 < size2 else size2 / size1) < threshold:
+        return 0.0
+
+    intersection = len(words1 & words2)
+    union = len(words1) + len(words2) - intersection
+
+    return intersection / union if union > 0 else 0.0
+
+
+class _SimilarityIndex:
+    """Inverted word index for exact Jaccard near-duplicate lookups.
+
+    A stored set B can only reach similarity t with a query A if they share at
+    least ceil(t * |A|) words. Any |A'| - ceil(t * |A|) + 1 of the query's
+    indexed words A' must therefore include one of them, so probing only that
+    many of the rarest words finds every candidate; exact Jaccard is then
+    computed for those candidates alone instead of for every stored entry.
+    """
+
+    def __init__(self):
+        self._word_sets: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def add(self, words: Set[str]):
+        """Index one word set."""
+        doc_id = len(self._word_sets)
+        self._word_sets.append(words)
+        for word in words:
+            self._postings.setdefault(word, []).append(doc_id)
+
+    def find_similar(self, words: Set[str], threshold: float) -> Optional[Tuple[int, float]]:
+        """Find the first indexed set with similarity >= threshold.
+
+        Args:
+            words: Query word set
+            threshold: Minimum Jaccard similarity
+
+        Returns:
+            (insertion index, similarity) of the earliest match, or None
+        """
+        if threshold <= 0:
+            # Every pair qualifies, even ones sharing no words
+            candidates = range(len(self._word_sets))
+        else:
+            known = [word for word in words if word in self._postings]
+            min_overlap = math.ceil(threshold * len(words) - 1e-9)
+            probe_count = len(known) - min_overlap + 1
+            if probe_count <= 0:
+                return None
+
+            known.sort(key=lambda word: len(self._postings[word]))
+            candidates = sorted({doc_id for word in known[:probe_count] for doc_id in self._postings[word]})
+
+        for doc_id in candidates:
+            similarity = _jaccard(words, self._word_sets[doc_id], threshold)
+            if similarity >= threshold:
+                return doc_id, similarity
+
+        return None
+
 
 class KnowledgeBaseManager:
     """Manages knowledge base operations with JSON storage."""
@@ -19,6 +138,16 @@ class KnowledgeBaseManager:
         self.kb_dir = Path(knowledge_base_dir)
         self.kb_dir.mkdir(exist_ok=True)
         self.metadata_file = self.kb_dir / ".import_metadata.json"
+        # Parsed entries and similarity indexes per category, tagged with the
+        # file signature they were built from
+        self._kb_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._similarity_indexes: Dict[str, Tuple[Tuple[int, int], _SimilarityIndex]] = {}
+        self._search_texts: Dict[str, Tuple[Tuple[int, int], List[Tuple[str, str]]]] = {}
+        # Content hashes per category as sets, valid for one metadata file version
+        self._hash_sets: Dict[str, Set[str]] = {}
+        self._hash_sets_signature: Optional[Tuple[int, int]] = None
+        # Hashes recorded in memory but not yet written to the metadata file
+        self._pending_hashes: Dict[str, List[str]] = {}
         self._ensure_metadata_exists()
 
     def load_knowledge_base(self, category: str) -> List[Dict[str, Any]]:
@@ -28,18 +157,62 @@ class KnowledgeBaseManager:
             category: Category name (e.g., 'fall', 'electrical', 'general')
 
         Returns:
-            List of knowledge base entries
+            List of knowledge base entries. The list is cached and shared
+            between calls until the file changes; copy it before modifying.
 
         Raises:
             FileNotFoundError: If knowledge base file doesn't exist
         """
         kb_file = self.kb_dir / f"{category}_base.json"
+        signature = self._file_signature(kb_file)
 
-        if not kb_file.exists():
-            raise FileNotFoundError(f"Knowledge base not found: {kb_file}")
+        cached = self._kb_cache.get(category)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        # Read raw bytes: orjson parses them directly and json.loads accepts UTF-8 bytes
+        with open(kb_file, 'rb') as f:
+            entries = _loads(f.read())
+
+        self._kb_cache[category] = (signature, entries)
+        return entries
+
+    def _iter_entries(self, category: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over knowledge base entries without caching the full list.
+
+        Uses the cached entries if they are current; otherwise the file is
+        decoded one entry at a time, for one-pass reads of large files.
+
+        Args:
+            category: Category name (e.g., 'fall', 'electrical', 'general')
+
+        Returns:
+            Iterator over knowledge base entries
+
+        Raises:
+            FileNotFoundError: If knowledge base file doesn't exist
+        """
+        kb_file = self.kb_dir / f"{category}_base.json"
+        signature = self._file_signature(kb_file)
+
+        cached = self._kb_cache.get(category)
+        if cached is not None and cached[0] == signature:
+            return iter(cached[1])
 
         with open(kb_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return _iter_json_array(f.read())
+
+    def _file_signature(self, kb_file: Path) -> Tuple[int, int]:
+        """Get (mtime_ns, size) of a knowledge base file, used to detect changes.
+
+        Raises:
+            FileNotFoundError: If knowledge base file doesn't exist
+        """
+        try:
+            stat = kb_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Knowledge base not found: {kb_file}")
+        return stat.st_mtime_ns, stat.st_size
 
     def save_knowledge_base(self, category: str, entries: List[Dict[str, Any]]):
         """Save a knowledge base to JSON file.
@@ -53,8 +226,75 @@ class KnowledgeBaseManager:
         with open(kb_file, 'w', encoding='utf-8') as f:
             json.dump(entries, f, indent=2, ensure_ascii=False)
 
+        self._kb_cache.pop(category, None)
+        self._similarity_indexes.pop(category, None)
+        self._search_texts.pop(category, None)
         print(f"💾 Saved {len(entries)} entries to {kb_file.name}")
 
+    def _append_entries(self, category: str, entries: List[Dict[str, Any]]) -> bool:
+        """Append entries to an existing knowledge base file without rewriting it.
+
+        Only the closing bracket is replaced, so the cost depends on the new
+        entries rather than the size of the file. A file written by
+        save_knowledge_base ends up byte-for-byte as if the combined list had
+        been saved.
+
+        Args:
+            category: Category name (e.g., 'fall', 'electrical', 'general')
+            entries: List of knowledge base entries to append
+
+        Returns:
+            True if appended, False if the file doesn't end in a JSON array
+
+        Raises:
+            FileNotFoundError: If knowledge base file doesn't exist
+        """
+        kb_file = self.kb_dir / f"{category}_base.json"
+        old_signature = self._file_signature(kb_file)
+        if not entries:
+            return True
+
+        # Match json.dump(..., indent=2): every element is indented one level.
+        # Strings never contain raw newlines in JSON, so indenting lines is safe.
+        serialized = ',\n'.join(
+            '  ' + json.dumps(entry, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            for entry in entries
+        ).encode('utf-8')
+
+        with open(kb_file, 'r+b') as f:
+            tail_start = max(0, old_signature[1] - 4096)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+            if not tail.endswith(b']'):
+                return False
+
+            # An element can't end with '[', so that means the array is empty
+            head = tail[:-1].rstrip()
+            if not head:
+                return False
+            separator = b'\n' if head.endswith(b'[') else b',\n'
+
+            f.seek(tail_start + len(head))
+            f.truncate()
+            f.write(separator + serialized + b'\n]')
+
+        # Carry the cached entries and similarity index over to the new file
+        # version instead of re-reading what was just written
+        new_signature = self._file_signature(kb_file)
+
+        cached = self._kb_cache.pop(category, None)
+        if cached is not None and cached[0] == old_signature:
+            self._kb_cache[category] = (new_signature, cached[1] + entries)
+
+        cached_index = self._similarity_indexes.pop(category, None)
+        if cached_index is not None and cached_index[0] == old_signature:
+            index = cached_index[1]
+            for entry in entries:
+                index.add(_tokenize(entry.get("content", "")))
+            self._similarity_indexes[category] = (new_signature, index)
+
+        return True
+
     def _ensure_metadata_exists(self):
         """Ensure the metadata file exists."""
         if not self.metadata_file.exists():
@@ -67,13 +307,61 @@ class KnowledgeBaseManager:
 
     def _load_metadata(self) -> Dict[str, Any]:
         """Load import metadata."""
-        with open(self.metadata_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.metadata_file, 'rb') as f:
+            return _loads(f.read())
 
     def _save_metadata(self, metadata: Dict[str, Any]):
-        """Save import metadata."""
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
+        """Save import metadata, including any pending content hashes."""
+        content_hashes = metadata.setdefault("content_hashes", {})
+        for category, pending in self._pending_hashes.items():
+            category_hashes = content_hashes.setdefault(category, [])
+            recorded = set(category_hashes)
+            category_hashes.extend(h for h in pending if h not in recorded)
+        self._pending_hashes = {}
+
+        # Writes through this class keep the hash sets in sync, so they stay
+        # valid for the new file version if they were valid for the old one
+        in_sync = self._hash_sets_signature == self._file_signature(self.metadata_file)
+
+        # Write to a temporary file first so a crash never leaves it truncated
+        tmp_file = self.metadata_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2)
+        os.replace(tmp_file, self.metadata_file)
+
+        if in_sync:
+            self._hash_sets_signature = self._file_signature(self.metadata_file)
+
+    def _flush_metadata(self):
+        """Write content hashes recorded by _record_content_hash to disk."""
+        if self._pending_hashes:
+            self._save_metadata(self._load_metadata())
+
+    def _get_content_hashes(self, category: str) -> Set[str]:
+        """Get the recorded content hashes of a category as a set.
+
+        The set is built once per metadata file version and kept up to date
+        by _record_content_hash, so lookups don't re-read the metadata.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Set of content hashes (shared; modified only by _record_content_hash)
+        """
+        signature = self._file_signature(self.metadata_file)
+        if signature != self._hash_sets_signature:
+            self._hash_sets = {}
+            self._hash_sets_signature = signature
+
+        hashes = self._hash_sets.get(category)
+        if hashes is None:
+            metadata = self._load_metadata()
+            hashes = set(metadata.get("content_hashes", {}).get(category, []))
+            hashes.update(self._pending_hashes.get(category, ()))
+            self._hash_sets[category] = hashes
+
+        return hashes
 
     def is_document_imported(self, filename: str) -> bool:
         """Check if a document has been imported before.
@@ -117,28 +405,44 @@ class KnowledgeBaseManager:
         normalized = ' '.join(content.lower().strip().split())
         return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
-    def _compute_similarity(self, text1: str, text2: str) -> float:
+    def _compute_similarity(self, text1: str, text2: str, threshold: float = 0.0) -> float:
         """Compute similarity between two texts using Jaccard similarity.
 
         Args:
             text1: First text
             text2: Second text
+            threshold: Similarity of interest; pairs whose word counts can't
+                reach it score 0.0 without a full comparison
 
         Returns:
             Similarity score between 0.0 and 1.0
         """
-        # Normalize texts
-        words1 = set(text1.lower().strip().split())
-        words2 = set(text2.lower().strip().split())
+        return _jaccard(_tokenize(text1), _tokenize(text2), threshold)
 
-        # Compute Jaccard similarity (intersection / union)
-        if not words1 or not words2:
-            return 0.0
+    def _get_similarity_index(self, category: str) -> Optional[_SimilarityIndex]:
+        """Get the word index of a category's entries, rebuilding it if the file changed.
 
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
+        Args:
+            category: Category name
+
+        Returns:
+            Similarity index, or None if the knowledge base doesn't exist yet
+        """
+        try:
+            signature = self._file_signature(self.kb_dir / f"{category}_base.json")
+        except FileNotFoundError:
+            return None
+
+        cached = self._similarity_indexes.get(category)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        index = _SimilarityIndex()
+        for entry in self.load_knowledge_base(category):
+            index.add(_tokenize(entry.get("content", "")))
 
-        return intersection / union if union > 0 else 0.0
+        self._similarity_indexes[category] = (signature, index)
+        return index
 
     def is_content_duplicate(self, content: str, category: str, similarity_threshold: float = 0.50) -> bool:
         """Check if similar content already exists in the knowledge base.
@@ -156,50 +460,41 @@ class KnowledgeBaseManager:
             True if duplicate or highly similar content exists
         """
         content_hash = self._compute_content_hash(content)
-        metadata = self._load_metadata()
 
         # Check for exact match first (fast)
-        category_hashes = metadata.get("content_hashes", {}).get(category, [])
-        if content_hash in category_hashes:
+        if content_hash in self._get_content_hashes(category):
             return True
 
-        # Check for high similarity (slower, but catches near-duplicates)
-        try:
-            kb_entries = self.load_knowledge_base(category)
-
-            for entry in kb_entries:
-                existing_content = entry.get("content", "")
-                similarity = self._compute_similarity(content, existing_content)
-
-                if similarity >= similarity_threshold:
-                    print(f"⚠️  Found {similarity*100:.1f}% similar content (threshold: {similarity_threshold*100:.0f}%)")
-                    return True
-
-        except FileNotFoundError:
+        # Check for high similarity (catches near-duplicates)
+        index = self._get_similarity_index(category)
+        if index is None:
             # Knowledge base doesn't exist yet, no duplicates
-            pass
+            return False
+
+        match = index.find_similar(_tokenize(content), similarity_threshold)
+        if match is not None:
+            similarity = match[1]
+            print(f"⚠️  Found {similarity*100:.1f}% similar content (threshold: {similarity_threshold*100:.0f}%)")
+            return True
 
         return False
 
     def _record_content_hash(self, content: str, category: str):
         """Record a content hash to prevent future duplicates.
 
+        The hash is kept in memory until the next metadata save; call
+        _flush_metadata once the batch is done.
+
         Args:
             content: Text content
             category: Category
         """
         content_hash = self._compute_content_hash(content)
-        metadata = self._load_metadata()
-
-        if "content_hashes" not in metadata:
-            metadata["content_hashes"] = {}
-
-        if category not in metadata["content_hashes"]:
-            metadata["content_hashes"][category] = []
+        hashes = self._get_content_hashes(category)
 
-        if content_hash not in metadata["content_hashes"][category]:
-            metadata["content_hashes"][category].append(content_hash)
-            self._save_metadata(metadata)
+        if content_hash not in hashes:
+            hashes.add(content_hash)
+            self._pending_hashes.setdefault(category, []).append(content_hash)
 
     def append_to_knowledge_base(
         self,
@@ -214,49 +509,50 @@ class KnowledgeBaseManager:
             new_entries: List of new entries to append
             skip_duplicates: If True, skip entries with duplicate content (default: True)
         """
-        kb_file = self.kb_dir / f"{category}_base.json"
-
-        # Load existing entries
-        if kb_file.exists():
-            with open(kb_file, 'r', encoding='utf-8') as f:
-                existing_entries = json.load(f)
-        else:
-            existing_entries = []
-
         # Filter out duplicates if requested
         entries_to_add = []
+        batch_index = _SimilarityIndex()  # Entries accepted from this batch
         skipped_duplicates = 0
 
-        for entry in new_entries:
-            content = entry.get("content", "")
-
-            # Check against existing KB
-            if skip_duplicates and self.is_content_duplicate(content, category):
-                skipped_duplicates += 1
-                continue
-
-            # Also check against entries we've already decided to add from this batch
-            is_duplicate_in_batch = False
-            if skip_duplicates:
-                for already_added in entries_to_add:
-                    similarity = self._compute_similarity(content, already_added.get("content", ""))
-                    if similarity >= 0.50:  # Use same threshold
-                        skipped_duplicates += 1
-                        is_duplicate_in_batch = True
-                        break
-
-            if is_duplicate_in_batch:
-                continue
-
-            entries_to_add.append(entry)
-            # Record the content hash
-            self._record_content_hash(content, category)
+        try:
+            for entry in new_entries:
+                content = entry.get("content", "")
+
+                # Check against existing KB
+                if skip_duplicates and self.is_content_duplicate(content, category):
+                    skipped_duplicates += 1
+                    continue
+
+                # Also check against entries we've already decided to add from this batch
+                words = _tokenize(content)
+                if skip_duplicates and batch_index.find_similar(words, 0.50) is not None:  # Use same threshold
+                    skipped_duplicates += 1
+                    continue
+
+                entries_to_add.append(entry)
+                batch_index.add(words)
+                # Record the content hash
+                self._record_content_hash(content, category)
+        finally:
+            # Write all recorded hashes at once instead of once per entry
+            self._flush_metadata()
+
+        # Append filtered entries in place, rewriting the whole file only if it
+        # doesn't exist yet or isn't a JSON array
+        try:
+            appended = self._append_entries(category, entries_to_add)
+        except FileNotFoundError:
+            appended = False
 
-        # Append filtered entries
-        existing_entries.extend(entries_to_add)
+        if not appended:
+            # Copy the existing entries, since the cached list is shared
+            try:
+                existing_entries = list(self.load_knowledge_base(category))
+            except FileNotFoundError:
+                existing_entries = []
 
-        # Save back
-        self.save_knowledge_base(category, existing_entries)
+            existing_entries.extend(entries_to_add)
+            self.save_knowledge_base(category, existing_entries)
 
         if skipped_duplicates > 0:
             print(f"⏭️  Skipped {skipped_duplicates} duplicate entries")
@@ -276,6 +572,35 @@ class KnowledgeBaseManager:
 
         return sorted(categories)
 
+    def _get_search_texts(self, category: str) -> List[Tuple[str, str]]:
+        """Get lowercased (title, content) pairs of a category's entries.
+
+        Built once per file version, so searches don't lowercase every entry
+        again for each query.
+
+        Args:
+            category: Category name
+
+        Returns:
+            One (title, content) pair per entry, in knowledge base order
+
+        Raises:
+            FileNotFoundError: If knowledge base file doesn't exist
+        """
+        signature = self._file_signature(self.kb_dir / f"{category}_base.json")
+
+        cached = self._search_texts.get(category)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        search_texts = [
+            (entry.get("title", "").lower(), entry.get("content", "").lower())
+            for entry in self.load_knowledge_base(category)
+        ]
+
+        self._search_texts[category] = (signature, search_texts)
+        return search_texts
+
     def search_knowledge_base(
         self,
         category: str,
@@ -293,13 +618,13 @@ class KnowledgeBaseManager:
             List of matching entries
         """
         entries = self.load_knowledge_base(category)
+        search_texts = self._get_search_texts(category)
         query_lower = query.lower()
 
         results = []
-        for entry in entries:
+        for entry, (title_lower, content_lower) in zip(entries, search_texts):
             # Search in title and content
-            if (query_lower in entry.get("title", "").lower() or
-                query_lower in entry.get("content", "").lower()):
+            if query_lower in title_lower or query_lower in content_lower:
                 results.append(entry)
 
                 if limit and len(results) >= limit:
@@ -337,21 +662,21 @@ class KnowledgeBaseManager:
         Returns:
             Dictionary with statistics
         """
-        entries = self.load_knowledge_base(category)
-
         # Count entries by internal category tag
         category_counts = {}
+        total_entries = 0
         total_content_length = 0
 
-        for entry in entries:
+        for entry in self._iter_entries(category):
             tag = entry.get("category", "unknown")
             category_counts[tag] = category_counts.get(tag, 0) + 1
+            total_entries += 1
             total_content_length += len(entry.get("content", ""))
 
         return {
-            "total_entries": len(entries),
+            "total_entries": total_entries,
             "categories": category_counts,
-            "avg_content_length": total_content_length // len(entries) if entries else 0,
+            "avg_content_length": total_content_length // total_entries if total_entries else 0,
             "total_content_length": total_content_length
         }
 
@@ -411,3 +736,21 @@ class KnowledgeBaseManager:
             print(f"✅ No duplicates found in {category}_base.json")
 
         return len(unique_entries)
+
+
+@lru_cache(maxsize=None)
+def get_knowledge_base_manager(knowledge_base_dir: str = "knowledge_base") -> KnowledgeBaseManager:
+    """Get the shared knowledge base manager for a directory.
+
+    Callers in one process reuse a single manager, so parsed entries,
+    similarity indexes and content hashes are built once instead of per
+    instance. Its caches check file signatures, so writes made outside it
+    are still picked up.
+
+    Args:
+        knowledge_base_dir: Path to the knowledge base directory
+
+    Returns:
+        KnowledgeBaseManager for the directory
+    """
+    return KnowledgeBaseManager(knowledge_base_dir)
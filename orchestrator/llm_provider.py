@@ -1,11 +1,44 @@
 """LLM Provider abstraction for supporting multiple AI providers."""
 
 from typing import Optional, Literal
-from langchain_anthropic import ChatAnthropic
 
 
 ProviderType = Literal["anthropic", "openai"]
 
+# Models offered per provider
+AVAILABLE_MODELS = {
+    "anthropic": (
+        "claude-3-5-sonnet-20241022",
+        "claude-3-opus-20240229",
+        "claude-3-sonnet-20240229",
+        "claude-3-haiku-20240307"
+    ),
+    "openai": (
+        "gpt-4o",
+        "gpt-4o-mini",
+        "gpt-4-turbo",
+        "gpt-4",
+        "gpt-3.5-turbo"
+    )
+}
+
+PROVIDER_INFO = {
+    "anthropic": {
+        "name": "Anthropic Claude",
+        "description": "Advanced AI assistant with strong reasoning capabilities",
+        "models": list(AVAILABLE_MODELS["anthropic"]),
+        "env_var": "ANTHROPIC_API_KEY",
+        "icon": "🤖"
+    },
+    "openai": {
+        "name": "OpenAI GPT",
+        "description": "Powerful language models from OpenAI",
+        "models": list(AVAILABLE_MODELS["openai"]),
+        "env_var": "OPENAI_API_KEY",
+        "icon": "🔮"
+    }
+}
+
 
 def get_llm(
     provider: ProviderType = "anthropic",
@@ -28,6 +61,9 @@ def get_llm(
         ValueError: If provider is not supported or API key is missing
     """
     if provider == "anthropic":
+        # Imported here so using one provider doesn't load the other's SDK
+        from langchain_anthropic import ChatAnthropic
+
         if not api_key:
             raise ValueError("Anthropic API key is required")
 
@@ -76,23 +112,7 @@ def get_available_models(provider: ProviderType) -> list[str]:
     Returns:
         List of model names
     """
-    if provider == "anthropic":
-        return [
-            "claude-3-5-sonnet-20241022",
-            "claude-3-opus-20240229",
-            "claude-3-sonnet-20240229",
-            "claude-3-haiku-20240307"
-        ]
-    elif provider == "openai":
-        return [
-            "gpt-4o",
-            "gpt-4o-mini",
-            "gpt-4-turbo",
-            "gpt-4",
-            "gpt-3.5-turbo"
-        ]
-    else:
-        return []
+    return list(AVAILABLE_MODELS.get(provider, ()))
 
 
 def get_provider_info(provider: ProviderType) -> dict:
@@ -102,23 +122,6 @@ def get_provider_info(provider: ProviderType) -> dict:
         provider: AI provider
 
     Returns:
-        Dictionary with provider information
+        Dictionary with provider information (shared; don't modify)
     """
-    providers = {
-        "anthropic": {
-            "name": "Anthropic Claude",
-            "description": "Advanced AI assistant with strong reasoning capabilities",
-            "models": get_available_models("anthropic"),
-            "env_var": "ANTHROPIC_API_KEY",
-            "icon": "🤖"
-        },
-        "openai": {
-            "name": "OpenAI GPT",
-            "description": "Powerful language models from OpenAI",
-            "models": get_available_models("openai"),
-            "env_var": "OPENAI_API_KEY",
-            "icon": "🔮"
-        }
-    }
-
-    return providers.get(provider, {})
+    return PROVIDER_INFO.get(provider, {})
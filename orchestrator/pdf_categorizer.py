@@ -1,7 +1,10 @@
 """PDF content categorizer using LLM analysis."""
 
-from typing import List, Dict, Any
-from langchain_core.prompts import ChatPromptTemplate
+import asyncio
+import json
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from langchain_core.messages import HumanMessage, SystemMessage
 
 
 class PDFCategorizer:
@@ -14,6 +17,68 @@ class PDFCategorizer:
         "general": "General workplace safety, multiple hazards, or other safety topics"
     }
 
+    # Static instructions, identical for every chunk. The document sample goes in
+    # the human message so this prefix can be served from the prompt cache.
+    SYSTEM_PROMPT = """You are a workplace safety expert. Analyze the following safety document content
+and determine which category it belongs to:
+
+**Categories:**
+- **fall**: Fall hazards, working at heights, ladders, scaffolding, fall protection, elevated work
+- **electrical**: Electrical safety, lockout/tagout, power lines, arc flash, wiring, electrical equipment
+- **struckby**: Struck-by hazards, vehicles, mobile equipment, falling objects, flying debris, rigging, load handling
+- **general**: General workplace safety, multiple hazards, or other safety topics
+
+**Instructions:**
+- Analyze the main topic and keywords in the document
+- Choose the MOST SPECIFIC category that best fits the content
+- If the document covers multiple hazard types equally, choose "general"
+- If the primary focus is on one specific hazard type, choose that category
+- Respond with ONLY the category name: fall, electrical, struckby, or general"""
+
+    QUESTION = "Based on this content, which category does this document belong to? Respond with only the category name."
+
+    BATCH_QUESTION = """Each excerpt above is a separate document. Categorize every excerpt.
+Respond with ONLY a JSON array containing one object per excerpt, for example:
+[{"id": 0, "category": "fall"}, {"id": 1, "category": "general"}]"""
+
+    # Upper bound on categorization requests in flight at once
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # High-signal terms per specific category. A sample that clearly leans to
+    # one category (KEYWORD_MIN_HITS matches, KEYWORD_MIN_MARGIN more than the
+    # runner-up) is labeled without asking the LLM; "general" is left to the LLM.
+    KEYWORD_PATTERNS = {
+        "fall": re.compile(
+            r"\b(?:fall (?:arrest|protection|hazards?)|scaffold\w*|ladders?|guardrails?|"
+            r"harness(?:es)?|lanyards?|anchorage|leading edges?|floor openings?|"
+            r"working at heights?|skylights?)\b",
+            re.IGNORECASE
+        ),
+        "electrical": re.compile(
+            r"\b(?:electric(?:al|ity)?|lockout|tagout|loto|arc flash|voltage|"
+            r"(?:de-)?energized|circuits?|gfci|power lines?|wiring|conductors?|grounding)\b",
+            re.IGNORECASE
+        ),
+        "struckby": re.compile(
+            r"\b(?:struck[- ]by|falling objects?|flying (?:objects?|debris)|cranes?|"
+            r"forklifts?|rigging|hoists?|suspended loads?|backing vehicles?|"
+            r"heavy equipment|dump trucks?|swing radius)\b",
+            re.IGNORECASE
+        )
+    }
+    KEYWORD_MIN_HITS = 3
+    KEYWORD_MIN_MARGIN = 2
+
+    # Chunks labeled per request by categorize_chunks; the shared system prompt
+    # and per-request overhead are paid once per batch instead of once per chunk
+    BATCH_SIZE = 20
+
+    # Categories of previously seen samples, shared by all instances (the app
+    # builds a new categorizer per upload). Keyed by (model, normalized sample);
+    # a plain dict in insertion order serves as the LRU.
+    CATEGORY_CACHE_SIZE = 4096
+    _category_cache: Dict[Tuple[str, str], str] = {}
+
     def __init__(self, llm):
         """Initialize the PDF categorizer.
 
@@ -21,6 +86,18 @@ class PDFCategorizer:
             llm: LLM instance for categorization
         """
         self.llm = llm
+        self._model_key = str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__)
+
+        # Anthropic needs an explicit cache breakpoint on the system block;
+        # other providers get the plain prompt (OpenAI caches prefixes automatically)
+        if getattr(llm, "_llm_type", "") == "anthropic-chat":
+            self._system_message = SystemMessage(content=[{
+                "type": "text",
+                "text": self.SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            }])
+        else:
+            self._system_message = SystemMessage(content=self.SYSTEM_PROMPT)
 
     def categorize_content(self, content: str) -> str:
         """Analyze PDF content and determine the best category.
@@ -31,56 +108,201 @@ class PDFCategorizer:
         Returns:
             Category name (fall, electrical, struckby, or general)
         """
+        cache_key = self._cache_key(content)
+        category = self._get_cached_category(cache_key)
+        if category is not None:
+            return category
+
+        category = self._keyword_category(content)
+        if category is not None:
+            return category
+
+        try:
+            response = self.llm.invoke(self._build_messages(content))
+            return self._cache_category(cache_key, self._parse_category(response.content))
+        except Exception as e:
+            print(f"⚠️ Categorization error: {e}, defaulting to 'general'")
+            return "general"
+
+    async def acategorize_content(self, content: str) -> str:
+        """Async version of categorize_content.
+
+        Args:
+            content: Extracted and cleaned text from PDF
+
+        Returns:
+            Category name (fall, electrical, struckby, or general)
+        """
+        cache_key = self._cache_key(content)
+        category = self._get_cached_category(cache_key)
+        if category is not None:
+            return category
+
+        category = self._keyword_category(content)
+        if category is not None:
+            return category
+
+        try:
+            response = await self.llm.ainvoke(self._build_messages(content))
+            return self._cache_category(cache_key, self._parse_category(response.content))
+        except Exception as e:
+            print(f"⚠️ Categorization error: {e}, defaulting to 'general'")
+            return "general"
+
+    async def acategorize_batch(self, contents: List[str]) -> List[str]:
+        """Categorize several pieces of content with a single LLM call.
+
+        Excerpts the model leaves out or labels with an unknown category are
+        categorized individually.
+
+        Args:
+            contents: Extracted and cleaned texts from PDF
+
+        Returns:
+            Category names (fall, electrical, struckby, or general), in input order
+        """
+        cache_keys = [self._cache_key(content) for content in contents]
+        categories = [
+            self._get_cached_category(cache_key) or self._keyword_category(content)
+            for cache_key, content in zip(cache_keys, contents)
+        ]
+        missing = [i for i, category in enumerate(categories) if category is None]
+
+        if len(missing) == 1:
+            i = missing[0]
+            categories[i] = await self.acategorize_content(contents[i])
+        elif missing:
+            try:
+                response = await self.llm.ainvoke(self._build_batch_messages([contents[i] for i in missing]))
+                parsed = self._parse_batch_categories(response.content, len(missing))
+            except Exception as e:
+                print(f"⚠️ Batch categorization error: {e}, categorizing individually")
+                parsed = [None] * len(missing)
+
+            retry = []
+            for i, category in zip(missing, parsed):
+                if category is None:
+                    retry.append(i)
+                else:
+                    categories[i] = self._cache_category(cache_keys[i], category)
+
+            retried = await asyncio.gather(*(self.acategorize_content(contents[i]) for i in retry))
+            for i, category in zip(retry, retried):
+                categories[i] = category
+
+        return categories
+
+    def _keyword_category(self, content: str) -> Optional[str]:
+        """Label content from keyword counts alone when one category clearly dominates.
+
+        Returns:
+            Category name, or None if the LLM should decide
+        """
+        sample = content[:2000]
+        scores = sorted(
+            ((len(pattern.findall(sample)), category) for category, pattern in self.KEYWORD_PATTERNS.items()),
+            reverse=True
+        )
+        (top_hits, category), (runner_up_hits, _) = scores[0], scores[1]
+
+        if top_hits >= self.KEYWORD_MIN_HITS and top_hits - runner_up_hits >= self.KEYWORD_MIN_MARGIN:
+            print(f"✅ Categorized as: {category} (keywords)")
+            return category
+        return None
+
+    def _build_messages(self, content: str) -> list:
+        """Build the categorization messages for one piece of content."""
         # Take a sample of the content (first 2000 chars for analysis)
         sample = content[:2000]
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a workplace safety expert. Analyze the following safety document content
-and determine which category it belongs to:
+        return [
+            self._system_message,
+            HumanMessage(content=f"**Document Content:**\n{sample}\n\n{self.QUESTION}")
+        ]
 
-**Categories:**
-- **fall**: Fall hazards, working at heights, ladders, scaffolding, fall protection, elevated work
-- **electrical**: Electrical safety, lockout/tagout, power lines, arc flash, wiring, electrical equipment
-- **struckby**: Struck-by hazards, vehicles, mobile equipment, falling objects, flying debris, rigging, load handling
-- **general**: General workplace safety, multiple hazards, or other safety topics
+    def _build_batch_messages(self, contents: List[str]) -> list:
+        """Build the categorization messages for several numbered excerpts."""
+        excerpts = "\n\n".join(
+            f"[{i}]:\n{content[:2000]}"
+            for i, content in enumerate(contents)
+        )
 
-**Instructions:**
-- Analyze the main topic and keywords in the document
-- Choose the MOST SPECIFIC category that best fits the content
-- If the document covers multiple hazard types equally, choose "general"
-- If the primary focus is on one specific hazard type, choose that category
-- Respond with ONLY the category name: fall, electrical, struckby, or general
+        return [
+            self._system_message,
+            HumanMessage(content=f"**Document Excerpts:**\n{excerpts}\n\n{self.BATCH_QUESTION}")
+        ]
 
-**Document Content:**
-{content}"""),
-            ("human", "Based on this content, which category does this document belong to? Respond with only the category name.")
-        ])
+    def _cache_key(self, content: str) -> Tuple[str, str]:
+        """Cache key for content: the model plus the whitespace/case-normalized sample."""
+        return (self._model_key, ' '.join(content[:2000].lower().split()))
 
-        try:
-            chain = prompt | self.llm
-            response = chain.invoke({"content": sample})
+    def _get_cached_category(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Look up a previous category in the LRU cache."""
+        category = self._category_cache.pop(cache_key, None)
+        if category is not None:
+            self._category_cache[cache_key] = category  # Re-insert as most recent
+        return category
 
-            # Extract category from response
-            category = response.content.strip().lower()
+    def _cache_category(self, cache_key: Tuple[str, str], category: str) -> str:
+        """Store a category in the LRU cache and return it.
 
-            # Validate category
-            if category in self.CATEGORIES:
-                print(f"✅ Categorized as: {category}")
-                return category
-            else:
-                print(f"⚠️ Unknown category '{category}', defaulting to 'general'")
-                return "general"
+        Only answers from the LLM are cached; errors are retried next time.
+        """
+        self._category_cache[cache_key] = category
+        if len(self._category_cache) > self.CATEGORY_CACHE_SIZE:
+            self._category_cache.pop(next(iter(self._category_cache)), None)
+        return category
 
-        except Exception as e:
-            print(f"⚠️ Categorization error: {e}, defaulting to 'general'")
+    def _parse_category(self, text: str) -> str:
+        """Validate the LLM answer, falling back to 'general'."""
+        # Extract category from response
+        category = text.strip().lower()
+
+        # Validate category
+        if category in self.CATEGORIES:
+            print(f"✅ Categorized as: {category}")
+            return category
+        else:
+            print(f"⚠️ Unknown category '{category}', defaulting to 'general'")
             return "general"
 
-    def categorize_chunks(self, chunks: List[Dict[str, Any]], llm) -> Dict[str, List[Dict[str, Any]]]:
-        """Analyze chunks individually and group by category.
+    def _parse_batch_categories(self, text: str, count: int) -> List[Optional[str]]:
+        """Read the JSON array answer of a batch request.
+
+        Returns:
+            Category per excerpt, None where the answer is missing or invalid
+        """
+        categories: List[Optional[str]] = [None] * count
+
+        # Tolerate prose or code fences around the array
+        try:
+            items = json.loads(text[text.index("["):text.rindex("]") + 1])
+        except ValueError:
+            return categories
+
+        if not isinstance(items, list):
+            return categories
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("id")
+            category = str(item.get("category", "")).strip().lower()
+            if isinstance(index, int) and 0 <= index < count and category in self.CATEGORIES:
+                categories[index] = category
+
+        return categories
+
+    async def categorize_chunks(self, chunks: List[Dict[str, Any]], llm=None) -> Dict[str, List[Dict[str, Any]]]:
+        """Categorize each chunk and group by category.
+
+        Chunks are sent BATCH_SIZE per request, with at most
+        MAX_CONCURRENT_REQUESTS requests in flight at a time; results keep the
+        original chunk order.
 
         Args:
             chunks: List of document chunks from PDF processor
-            llm: LLM instance for categorization
+            llm: Unused, kept for backward compatibility (the categorizer's LLM is used)
 
         Returns:
             Dictionary mapping categories to lists of chunks
@@ -91,13 +313,28 @@ and determine which category it belongs to:
 
         categorized = {"fall": [], "electrical": [], "struckby": [], "general": []}
 
-        print(f"\n🔍 Analyzing {len(chunks)} chunks individually...")
+        print(f"\n🔍 Analyzing {len(chunks)} chunks...")
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def categorize_batch(batch: List[str]) -> List[str]:
+            async with semaphore:
+                return await self.acategorize_batch(batch)
 
-        for i, chunk in enumerate(chunks, 1):
-            # Categorize each chunk based on its content
-            content = chunk["content"]
-            category = self.categorize_content(content)
+        # Chunks with the same normalized sample (repeated boilerplate) share one request
+        cache_keys = [self._cache_key(chunk["content"]) for chunk in chunks]
+        unique_contents = {}
+        for cache_key, chunk in zip(cache_keys, chunks):
+            unique_contents.setdefault(cache_key, chunk["content"])
 
+        contents = list(unique_contents.values())
+        batches = [contents[i:i + self.BATCH_SIZE] for i in range(0, len(contents), self.BATCH_SIZE)]
+        batch_results = await asyncio.gather(*(categorize_batch(batch) for batch in batches))
+        results = [category for batch_result in batch_results for category in batch_result]
+        category_by_key = dict(zip(unique_contents, results))
+        categories = [category_by_key[cache_key] for cache_key in cache_keys]
+
+        for i, (chunk, category) in enumerate(zip(chunks, categories), 1):
             # Update chunk category
             chunk["category"] = category
 
@@ -113,3 +350,14 @@ and determine which category it belongs to:
                 print(f"   {cat}: {len(items)} chunks")
 
         return categorized
+
+    def categorize_chunks_sync(self, chunks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Synchronous wrapper for categorize_chunks.
+
+        Args:
+            chunks: List of document chunks from PDF processor
+
+        Returns:
+            Dictionary mapping categories to lists of chunks
+        """
+        return asyncio.run(self.categorize_chunks(chunks))
@@ -1,9 +1,24 @@
 """PDF processor for adding safety documents to knowledge base."""
 
+import json
+import os
 import re
-from typing import List, Dict, Any
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF is optional; PDFs are read with PyPDF2 instead
+    pymupdf = None
+
 
 class PDFProcessor:
     """Process PDF files and extract clean safety content."""
@@ -50,8 +65,40 @@ class PDFProcessor:
         r"^section \d+$",
     ]
 
-    def __init__(self):
-        """Initialize the PDF processor."""
+    # Compiled once at class creation instead of being looked up by pattern
+    # string on every call
+    _UNWANTED_RE = re.compile('|'.join(f'(?:{p})' for p in UNWANTED_PATTERNS))
+    # One alternation, so each line costs a single match call
+    _PAGE_MARKER_RE = re.compile('|'.join(f'(?:{p})' for p in PAGE_MARKERS))
+    _NEXT_SECTION_RE = re.compile(r'\n\n[A-Z][A-Z\s]{10,}|\n\n\d+\.\s+[A-Z]')
+    # Runs of 3+ newlines (group 1) or 2+ spaces (group 2); substituting
+    # r'\1\1\2' leaves two newlines or one space
+    _EXCESS_WHITESPACE_RE = re.compile(r'(\n)\n\n+|( ) +')
+    _NUMBERED_HEADER_RE = re.compile(r'^\d+[\.:]\s+[A-Z]')
+    _CAPS_WORD_RE = re.compile(r'\b[A-Z]{2,}\b')
+
+    PDF_BACKENDS = ("auto", "pymupdf", "pypdf2")
+
+    def __init__(self, backend: str = "auto"):
+        """Initialize the PDF processor.
+
+        Args:
+            backend: PDF text extractor: "pymupdf" (fast, C-based), "pypdf2",
+                or "auto" to use PyMuPDF when installed and PyPDF2 otherwise
+
+        Raises:
+            ValueError: If backend is not one of PDF_BACKENDS
+            ImportError: If backend is "pymupdf" and PyMuPDF is not installed
+        """
+        if backend not in self.PDF_BACKENDS:
+            raise ValueError(f"Unsupported PDF backend: {backend}. Choose one of {self.PDF_BACKENDS}")
+        if backend == "pymupdf" and pymupdf is None:
+            raise ImportError(
+                "PyMuPDF is required for the 'pymupdf' backend. "
+                "Install it with: pip install pymupdf"
+            )
+
+        self.backend = backend
         self.min_chunk_size = 200  # Minimum characters per chunk
         self.max_chunk_size = 2000  # Maximum characters per chunk
 
@@ -65,22 +112,49 @@ class PDFProcessor:
             Extracted text content
 
         Raises:
-            ImportError: If PyPDF2 is not installed
+            ImportError: If PyPDF2 is needed but not installed
             FileNotFoundError: If PDF file doesn't exist
         """
-        try:
-            import PyPDF2
-        except ImportError:
-            raise ImportError(
-                "PyPDF2 is required for PDF processing. "
-                "Install it with: pip install PyPDF2"
-            )
+        return "\n\n".join(self._iter_pdf_pages(pdf_path))
+
+    def _iter_pdf_pages(self, pdf_path: str) -> Iterator[str]:
+        """Yield the text of each non-empty PDF page as it is extracted.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Yields:
+            Text of one page; pages without text are skipped
+
+        Raises:
+            ImportError: If PyPDF2 is needed but not installed
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        use_mupdf = self.backend == "pymupdf" or (self.backend == "auto" and pymupdf is not None)
+
+        if not use_mupdf:
+            try:
+                import PyPDF2
+            except ImportError:
+                raise ImportError(
+                    "PyPDF2 is required for PDF processing. "
+                    "Install it with: pip install PyPDF2 (or pymupdf for faster extraction)"
+                )
 
         pdf_file = Path(pdf_path)
         if not pdf_file.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-        text_content = []
+        if use_mupdf:
+            with pymupdf.open(pdf_path) as doc:
+                for page_num, page in enumerate(doc):
+                    try:
+                        text = page.get_text()
+                        if text.strip():
+                            yield text
+                    except Exception as e:
+                        print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
+            return
 
         with open(pdf_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
@@ -89,12 +163,10 @@ class PDFProcessor:
                 try:
                     text = page.extract_text()
                     if text.strip():
-                        text_content.append(text)
+                        yield text
                 except Exception as e:
                     print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
 
-        return "\n\n".join(text_content)
-
     def clean_text(self, text: str) -> str:
         """Clean extracted text by removing unwanted sections.
 
@@ -104,56 +176,71 @@ class PDFProcessor:
         Returns:
             Cleaned text
         """
+        # Blank input (e.g. a scanned PDF without a text layer) cleans to nothing
+        if text.isspace() or not text:
+            return ""
+
         # Convert to lowercase for pattern matching
         text_lower = text.lower()
 
-        # Find and remove unwanted sections
-        for pattern in self.UNWANTED_PATTERNS:
-            # Find section headers
-            matches = list(re.finditer(pattern, text_lower))
-            for match in reversed(matches):  # Remove from end to maintain indices
-                # Try to find the end of this section (next section header or end)
-                start = match.start()
-
-                # Remove section header and some content after it
-                # Look for next major section (typically all caps or numbered)
-                next_section = re.search(
-                    r'\n\n[A-Z][A-Z\s]{10,}|\n\n\d+\.\s+[A-Z]',
-                    text[start + 100:start + 1000]
-                )
-
-                if next_section:
-                    end = start + 100 + next_section.start()
-                else:
-                    end = min(start + 500, len(text))  # Remove up to 500 chars
-
-                text = text[:start] + text[end:]
+        # Find all unwanted sections in one sweep over the original text
+        cuts = []
+        for match in self._UNWANTED_RE.finditer(text_lower):
+            # Try to find the end of this section (next section header or end)
+            start = match.start()
+
+            # Remove section header and some content after it
+            # Look for next major section (typically all caps or numbered)
+            next_section = self._NEXT_SECTION_RE.search(text, start + 100, start + 1000)
+
+            if next_section:
+                end = next_section.start()
+            else:
+                end = min(start + 500, len(text))  # Remove up to 500 chars
+
+            cuts.append((start, end))
+
+        # Keep the text between the (possibly overlapping) sections, copying it once
+        if cuts:
+            kept = []
+            position = 0
+            for start, end in cuts:
+                if start > position:
+                    kept.append(text[position:start])
+                position = max(position, end)
+            kept.append(text[position:])
+            text = ''.join(kept)
 
         # Remove page markers and headers/footers
         lines = text.split('\n')
         cleaned_lines = []
 
+        # Bound once; this loop runs for every line of the document
+        page_marker_match = self._PAGE_MARKER_RE.match
+        keep_line = cleaned_lines.append
+
         for line in lines:
-            line_lower = line.lower().strip()
+            line_stripped = line.strip()
 
-            # Skip if matches page marker patterns
-            if any(re.match(pattern, line_lower) for pattern in self.PAGE_MARKERS):
+            # Skip very short lines that are likely headers/footers
+            if len(line_stripped) < 10 and not line_stripped.isdigit():
                 continue
 
-            # Skip very short lines that are likely headers/footers
-            if len(line.strip()) < 10 and not line.strip().isdigit():
+            # Skip if matches page marker patterns
+            if page_marker_match(line_stripped.lower()):
                 continue
 
-            cleaned_lines.append(line)
+            keep_line(line)
 
         text = '\n'.join(cleaned_lines)
 
-        # Remove repeated content (common in headers/footers)
-        text = self._remove_repeated_content(text)
+        # Remove repeated content (common in headers/footers); a single
+        # paragraph can't repeat
+        if '\n\n' in text:
+            text = self._remove_repeated_content(text)
 
-        # Clean up whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Max 2 newlines
-        text = re.sub(r' {2,}', ' ', text)  # Max 1 space
+        # Clean up whitespace: max 2 newlines and max 1 space, in one pass
+        text = self._EXCESS_WHITESPACE_RE.sub(r'\1\1\2', text)
         text = text.strip()
 
         return text
@@ -170,21 +257,26 @@ class PDFProcessor:
         paragraphs = text.split('\n\n')
         seen = set()
         unique_paragraphs = []
+        mark_seen = seen.add
+        keep_paragraph = unique_paragraphs.append
 
         for para in paragraphs:
             para_clean = para.strip().lower()
+            # Track hashes rather than the lowercased copies to keep memory per
+            # paragraph constant; a 64-bit collision within one document is negligible
+            para_hash = hash(para_clean)
 
             # Skip if we've seen this paragraph before
-            if para_clean in seen:
+            if para_hash in seen:
                 continue
 
             # Skip very short paragraphs (likely headers)
             if len(para_clean) < 30:
-                unique_paragraphs.append(para)
+                keep_paragraph(para)
                 continue
 
-            seen.add(para_clean)
-            unique_paragraphs.append(para)
+            mark_seen(para_hash)
+            keep_paragraph(para)
 
         return '\n\n'.join(unique_paragraphs)
 
@@ -201,46 +293,55 @@ class PDFProcessor:
         # Split by double newlines (paragraphs)
         paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
 
+        # Every chunk shares the category, and repeated headers share a title
+        category = sys.intern(category)
+
         chunks = []
-        current_chunk = ""
+        # Paragraphs of the chunk being built, joined only when it is saved;
+        # chunk_len tracks the joined length including separators
+        current_paras: List[str] = []
+        chunk_len = 0
         current_title = "Safety Information"
 
         for para in paragraphs:
             # Check if this looks like a section header
             if self._is_section_header(para):
                 # Save current chunk if it's substantial
-                if len(current_chunk) >= self.min_chunk_size:
+                if chunk_len >= self.min_chunk_size:
                     chunks.append({
                         "title": current_title,
-                        "content": current_chunk.strip(),
+                        "content": "\n\n".join(current_paras).strip(),
                         "category": category
                     })
 
                 # Start new chunk with new title
-                current_title = para[:100]  # Limit title length
-                current_chunk = ""
+                current_title = sys.intern(para[:100])  # Limit title length
+                current_paras = []
+                chunk_len = 0
                 continue
 
             # Add paragraph to current chunk
-            if current_chunk:
-                current_chunk += "\n\n"
-            current_chunk += para
+            if current_paras:
+                chunk_len += 2
+            current_paras.append(para)
+            chunk_len += len(para)
 
             # If chunk is getting large, save it
-            if len(current_chunk) >= self.max_chunk_size:
+            if chunk_len >= self.max_chunk_size:
                 chunks.append({
                     "title": current_title,
-                    "content": current_chunk.strip(),
+                    "content": "\n\n".join(current_paras).strip(),
                     "category": category
                 })
-                current_chunk = ""
+                current_paras = []
+                chunk_len = 0
                 current_title = "Safety Information (continued)"
 
         # Add final chunk
-        if len(current_chunk) >= self.min_chunk_size:
+        if chunk_len >= self.min_chunk_size:
             chunks.append({
                 "title": current_title,
-                "content": current_chunk.strip(),
+                "content": "\n\n".join(current_paras).strip(),
                 "category": category
             })
 
@@ -255,17 +356,21 @@ class PDFProcessor:
         Returns:
             True if looks like a section header
         """
+        is_short = len(text) < 100
+
         # Short and mostly uppercase
-        if len(text) < 100 and text.isupper():
+        if is_short and text.isupper():
             return True
 
-        # Starts with number and colon or period
-        if re.match(r'^\d+[\.:]\s+[A-Z]', text):
+        # Starts with number and colon or period; only digits can start a match
+        if text[:1].isdigit() and self._NUMBERED_HEADER_RE.match(text):
             return True
 
-        # All caps words
-        if len(text) < 100 and len(re.findall(r'\b[A-Z]{2,}\b', text)) >= 2:
-            return True
+        # All caps words; stop scanning at the second one
+        if is_short:
+            caps_words = self._CAPS_WORD_RE.finditer(text)
+            if next(caps_words, None) and next(caps_words, None):
+                return True
 
         return False
 
@@ -288,6 +393,7 @@ class PDFProcessor:
 
         print(f"✨ Cleaning text ({len(raw_text)} characters)")
         cleaned_text = self.clean_text(raw_text)
+        del raw_text  # Don't keep the raw document alive while chunking
 
         print(f"📦 Chunking into documents ({len(cleaned_text)} characters)")
         chunks = self.chunk_text(cleaned_text, category)
@@ -296,24 +402,51 @@ class PDFProcessor:
 
         return chunks
 
+    def process_pdfs(
+        self,
+        pdf_paths: List[str],
+        category: str = "general",
+        max_workers: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run process_pdf on several PDFs in parallel worker processes.
+
+        PyPDF2 extraction is pure Python and holds the GIL, so files are spread
+        over processes rather than threads. Progress lines from different
+        workers may interleave.
+
+        Args:
+            pdf_paths: Paths to PDF files
+            category: Category for the documents
+            max_workers: Number of worker processes (default: one per CPU,
+                at most one per file)
+
+        Returns:
+            List of processed knowledge base documents per PDF, in input order
+        """
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, len(pdf_paths))
+
+        if max_workers <= 1 or len(pdf_paths) <= 1:
+            return [self.process_pdf(pdf_path, category) for pdf_path in pdf_paths]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.process_pdf, pdf_paths, repeat(category)))
+
     def save_chunks_to_file(self, chunks: List[Dict[str, Any]], output_path: str):
-        """Save processed chunks to a Python file.
+        """Save processed chunks to a JSON file.
+
+        The file uses the same list-of-entries layout as the knowledge base
+        JSON files, so it can be loaded or merged like any ``*_base.json``.
 
         Args:
             chunks: List of document dictionaries
-            output_path: Path to save the Python file
+            output_path: Path of the JSON file to write
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# Auto-generated knowledge base from PDF\n\n")
-            f.write("KNOWLEDGE_BASE = [\n")
-
-            for chunk in chunks:
-                f.write("    {\n")
-                f.write(f'        "title": """{chunk["title"]}""",\n')
-                f.write(f'        "content": """{chunk["content"]}""",\n')
-                f.write(f'        "category": "{chunk["category"]}"\n')
-                f.write("    },\n")
-
-            f.write("]\n")
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(chunks, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(chunks, f, indent=2, ensure_ascii=False)
 
         print(f"💾 Saved to: {output_path}")
@@ -1,11 +1,18 @@
 """Question filter to ensure only safety-related queries are processed."""
 
+from typing import Dict, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 
 
 class SafetyQuestionFilter:
     """Filter to validate if questions are safety-related."""
 
+    # Categories of previously seen questions, shared by all filters. Keyed by
+    # (model, normalized question); a plain dict in insertion order serves as
+    # the LRU.
+    CATEGORY_CACHE_SIZE = 1024
+    _category_cache: Dict[Tuple[str, str], str] = {}
+
     def __init__(self, llm):
         """Initialize the question filter.
 
@@ -13,6 +20,8 @@ class SafetyQuestionFilter:
             llm: LLM instance for question analysis
         """
         self.llm = llm
+        self._model_key = str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__)
+        self._chain = self._build_chain()
 
     def is_safety_related(self, question: str) -> tuple[bool, str]:
         """Check if a question is related to workplace safety.
@@ -24,6 +33,46 @@ class SafetyQuestionFilter:
             Tuple of (is_safety_related: bool, category: str)
             category is one of: 'safety', 'hr', 'general', 'personal'
         """
+        cache_key = self._cache_key(question)
+        category = self._get_cached_category(cache_key)
+        if category is not None:
+            return category == 'safety', category
+
+        try:
+            response = self._chain.invoke({"question": question})
+            return self._cache_category(cache_key, self._parse_category(response.content))
+
+        except Exception as e:
+            print(f"⚠️ Question filter error: {e}, allowing question")
+            # Default to allowing the question if error
+            return True, 'safety'
+
+    async def is_safety_related_async(self, question: str) -> tuple[bool, str]:
+        """Async version of is_safety_related.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Tuple of (is_safety_related: bool, category: str)
+            category is one of: 'safety', 'hr', 'general', 'personal'
+        """
+        cache_key = self._cache_key(question)
+        category = self._get_cached_category(cache_key)
+        if category is not None:
+            return category == 'safety', category
+
+        try:
+            response = await self._chain.ainvoke({"question": question})
+            return self._cache_category(cache_key, self._parse_category(response.content))
+
+        except Exception as e:
+            print(f"⚠️ Question filter error: {e}, allowing question")
+            # Default to allowing the question if error
+            return True, 'safety'
+
+    def _build_chain(self):
+        """Build the classification prompt chain."""
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a workplace safety expert. Analyze the following question and determine if it's related to workplace safety.
 
@@ -68,25 +117,41 @@ Analyze the question and respond with ONLY ONE WORD:
             ("human", "Is this a workplace safety question? Answer with one word only: safety, hr, general, or personal")
         ])
 
-        try:
-            chain = prompt | self.llm
-            response = chain.invoke({"question": question})
+        return prompt | self.llm
 
-            category = response.content.strip().lower()
+    def _cache_key(self, question: str) -> Tuple[str, str]:
+        """Cache key for a question: the model plus the whitespace/case-normalized text."""
+        return (self._model_key, ' '.join(question.lower().split()))
 
-            # Validate response
-            valid_categories = ['safety', 'hr', 'general', 'personal']
-            if category not in valid_categories:
-                # Default to safety if unclear
-                category = 'safety'
+    def _get_cached_category(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Look up a previous category in the LRU cache."""
+        category = self._category_cache.pop(cache_key, None)
+        if category is not None:
+            self._category_cache[cache_key] = category  # Re-insert as most recent
+        return category
 
-            is_safety = (category == 'safety')
-            return is_safety, category
+    def _cache_category(self, cache_key: Tuple[str, str], result: tuple[bool, str]) -> tuple[bool, str]:
+        """Store a parsed LLM answer in the LRU cache and return it.
 
-        except Exception as e:
-            print(f"⚠️ Question filter error: {e}, allowing question")
-            # Default to allowing the question if error
-            return True, 'safety'
+        Only answers from the LLM are cached; errors are retried next time.
+        """
+        self._category_cache[cache_key] = result[1]
+        if len(self._category_cache) > self.CATEGORY_CACHE_SIZE:
+            self._category_cache.pop(next(iter(self._category_cache)), None)
+        return result
+
+    def _parse_category(self, text: str) -> tuple[bool, str]:
+        """Turn the LLM answer into (is_safety_related, category)."""
+        category = text.strip().lower()
+
+        # Validate response
+        valid_categories = ['safety', 'hr', 'general', 'personal']
+        if category not in valid_categories:
+            # Default to safety if unclear
+            category = 'safety'
+
+        is_safety = (category == 'safety')
+        return is_safety, category
 
     def get_redirect_message(self, category: str) -> str:
         """Get appropriate redirect message for non-safety questions.
@@ -1,10 +1,12 @@
 """Router for determining which safety skill should handle a query."""
 
-from typing import List, Dict, Any
-from langchain_anthropic import ChatAnthropic
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
 
 class RouteDecision(BaseModel):
     """Model for routing decision."""
@@ -17,13 +19,20 @@ class RouteDecision(BaseModel):
 class SafetyRouter:
     """Routes queries to appropriate safety skills."""
 
-    def __init__(self, llm: ChatAnthropic):
+    # LLM routing answers for previously seen queries, shared by all routers.
+    # Keyed by (model, normalized query); a plain dict in insertion order
+    # serves as the LRU.
+    ROUTE_CACHE_SIZE = 1024
+    _route_cache: Dict[Tuple[str, str], str] = {}
+
+    def __init__(self, llm: "ChatAnthropic"):
         """Initialize the router.
 
         Args:
             llm: ChatAnthropic instance for routing decisions
         """
         self.llm = llm
+        self._model_key = str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__)
 
         # Define available skills
         self.skills = {
@@ -58,6 +67,39 @@ class SafetyRouter:
             }
         }
 
+        # Each distinct keyword with the skills that list it, so keywords shared
+        # between skills are only searched for once per query
+        keyword_skills: Dict[str, List[str]] = {}
+        for skill_id, skill_info in self.skills.items():
+            for keyword in skill_info["keywords"]:
+                keyword_skills.setdefault(keyword, []).append(skill_id)
+        self._keyword_skills = list(keyword_skills.items())
+
+        # Build the LLM routing chain once; skill descriptions are fixed per router
+        skill_descriptions = "\n".join([
+            f"- **{skill_id}**: {info['description']}"
+            for skill_id, info in self.skills.items()
+        ])
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a routing assistant for a corporate safety system.
+Your job is to determine which safety skill should handle a user's question.
+
+Available skills:
+{skill_descriptions}
+
+Analyze the user's question and determine which skill is most appropriate.
+- Choose 'fall' for questions about fall protection, heights, ladders, scaffolding
+- Choose 'electrical' for questions about electrical safety, power, lockout/tagout
+- Choose 'struckby' for questions about struck-by hazards, vehicles, falling/flying objects
+- Choose 'general' if the question doesn't fit any specific skill or covers multiple skills
+
+Respond with just the skill name: fall, electrical, struckby, or general"""),
+            ("human", "{query}")
+        ]).partial(skill_descriptions=skill_descriptions)
+
+        self._chain = prompt | self.llm
+
     def _keyword_based_routing(self, query: str) -> Dict[str, float]:
         """Simple keyword-based routing as a fallback.
 
@@ -68,14 +110,12 @@ class SafetyRouter:
             Dictionary mapping skill names to scores
         """
         query_lower = query.lower()
-        scores = {}
+        scores = dict.fromkeys(self.skills, 0)
 
-        for skill_id, skill_info in self.skills.items():
-            score = 0
-            for keyword in skill_info["keywords"]:
-                if keyword in query_lower:
-                    score += 1
-            scores[skill_id] = score
+        for keyword, skill_ids in self._keyword_skills:
+            if keyword in query_lower:
+                for skill_id in skill_ids:
+                    scores[skill_id] += 1
 
         return scores
 
@@ -98,37 +138,19 @@ class SafetyRouter:
 
         # Otherwise, use LLM for more nuanced routing
         try:
-            # Build skill descriptions
-            skill_descriptions = "\n".join([
-                f"- **{skill_id}**: {info['description']}"
-                for skill_id, info in self.skills.items()
-            ])
-
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a routing assistant for a corporate safety system.
-Your job is to determine which safety skill should handle a user's question.
-
-Available skills:
-{skill_descriptions}
-
-Analyze the user's question and determine which skill is most appropriate.
-- Choose 'fall' for questions about fall protection, heights, ladders, scaffolding
-- Choose 'electrical' for questions about electrical safety, power, lockout/tagout
-- Choose 'struckby' for questions about struck-by hazards, vehicles, falling/flying objects
-- Choose 'general' if the question doesn't fit any specific skill or covers multiple skills
+            cache_key = (self._model_key, ' '.join(query.lower().split()))
+            skill = self._route_cache.pop(cache_key, None)
 
-Respond with just the skill name: fall, electrical, struckby, or general"""),
-                ("human", "{query}")
-            ])
+            if skill is None:
+                response = await self._chain.ainvoke({"query": query})
 
-            chain = prompt | self.llm
-            response = await chain.ainvoke({
-                "skill_descriptions": skill_descriptions,
-                "query": query
-            })
+                # Extract skill from response
+                skill = response.content.strip().lower()
 
-            # Extract skill from response
-            skill = response.content.strip().lower()
+            # (Re-)insert as most recent, evicting the oldest answer when full
+            self._route_cache[cache_key] = skill
+            if len(self._route_cache) > self.ROUTE_CACHE_SIZE:
+                self._route_cache.pop(next(iter(self._route_cache)), None)
 
             # Validate the response
             if skill in self.skills or skill == "general":
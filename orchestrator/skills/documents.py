@@ -0,0 +1,45 @@
+"""Knowledge base entries as LangChain documents, shared by the skills."""
+
+import sys
+import os
+from typing import Any, Dict, List, Tuple
+from langchain_core.documents import Document
+
+# Add parent directory to path for knowledge_base import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from knowledge_base import load_knowledge_base
+
+
+# Documents per category, with the entries list they were built from
+_documents_cache: Dict[str, Tuple[List[Dict[str, Any]], Tuple[Document, ...]]] = {}
+
+
+def load_documents(category: str) -> Tuple[Document, ...]:
+    """Load knowledge base entries for a category as documents.
+
+    Results are memoized per category for as long as load_knowledge_base
+    returns the same entries list, i.e. until the knowledge base file
+    changes, so skill instances share the same Document objects. Callers
+    must treat them as read-only.
+
+    Args:
+        category: Category name ('fall', 'electrical', 'struckby', 'general')
+
+    Returns:
+        Tuple of documents with title and category metadata
+    """
+    entries = load_knowledge_base(category)
+
+    cached = _documents_cache.get(category)
+    if cached is not None and cached[0] is entries:
+        return cached[1]
+
+    documents = tuple(
+        Document(
+            page_content=item["content"],
+            metadata={"title": item["title"], "category": item["category"]}
+        )
+        for item in entries
+    )
+    _documents_cache[category] = (entries, documents)
+    return documents
@@ -1,21 +1,29 @@
 """Electrical Hazard Detection and Prevention Skill."""
 
-import sys
-import os
-from typing import Dict, Any, List
-from langchain_anthropic import ChatAnthropic
+import heapq
+from typing import Dict, Any, List, TYPE_CHECKING
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 
-# Add parent directory to path for knowledge_base import
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from knowledge_base import load_knowledge_base
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+from .documents import load_documents
 
 
 class ElectricalHazardSkill:
     """Skill for handling electrical hazard queries."""
 
-    def __init__(self, llm: ChatAnthropic):
+    # Generation cap for answers, a little above the 1500-character SMS limit
+    # (~4 characters per token) so the model isn't billed for text that gets cut
+    MAX_RESPONSE_TOKENS = 450
+
+    # Retrieval keywords; a document gains points for each one it shares with the query
+    KEYWORDS = ["electric", "electrical", "shock", "power", "voltage", "wire",
+                "loto", "lockout", "tagout", "arc", "flash", "ground", "gfci",
+                "circuit", "energize", "de-energize"]
+
+    def __init__(self, llm: "ChatAnthropic"):
         """Initialize the electrical hazard skill.
 
         Args:
@@ -25,18 +33,51 @@ class ElectricalHazardSkill:
         self.name = "Electrical Hazard"
         self.description = "Handles questions about electrical safety, lockout/tagout, power lines, arc flash, and electrical equipment"
 
-        # Load knowledge base from centralized knowledge_base folder
-        full_kb = load_knowledge_base("electrical")
-
-        # Convert knowledge base to documents
-        self.documents = [
-            Document(
-                page_content=item["content"],
-                metadata={"title": item["title"], "category": item["category"]}
+        # Load knowledge base documents from centralized knowledge_base folder
+        # (shared with other instances of this skill)
+        self.documents = list(load_documents("electrical"))
+
+        # Lowercased text and, per keyword, the documents whose content and
+        # title contain it, so queries don't rescan the knowledge base per keyword
+        self._content_lower = [doc.page_content.lower() for doc in self.documents]
+        self._title_lower = [doc.metadata["title"].lower() for doc in self.documents]
+        self._keyword_index = {
+            keyword: (
+                [i for i, content in enumerate(self._content_lower) if keyword in content],
+                [i for i, title in enumerate(self._title_lower) if keyword in title]
             )
-            for item in full_kb
+            for keyword in self.KEYWORDS
+        }
+
+        # Context block of each document, as inserted into the prompt
+        self._doc_formatted = [
+            f"**{doc.metadata['title']}**\n{doc.page_content}"
+            for doc in self.documents
         ]
 
+        # Create prompt with SMS constraints
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a corporate safety expert specializing in electrical hazards and safety.
+Your role is to provide accurate, practical safety advice based on OSHA standards and NFPA 70E guidelines.
+
+Use the following knowledge base to answer questions:
+
+{context}
+
+CRITICAL CONSTRAINTS:
+- Keep response under 1500 characters (SMS-ready)
+- Be clear, direct, and concise
+- Use bullet points for readability
+- Only answer based on the knowledge base provided
+- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
+- Reference specific regulations when applicable (OSHA 1910.333, NFPA 70E)
+- Emphasize lockout/tagout and de-energization
+- Prioritize worker safety"""),
+            ("human", "{query}")
+        ])
+
+        self._chain = prompt | self.llm.bind(max_tokens=self.MAX_RESPONSE_TOKENS)
+
     def _retrieve_relevant_docs(self, query: str, top_k: int = 3) -> tuple[List[Document], float]:
         """Simple keyword-based retrieval of relevant documents.
 
@@ -47,46 +88,50 @@ class ElectricalHazardSkill:
         Returns:
             Tuple of (List of relevant documents, confidence score)
         """
-        query_lower = query.lower()
-
-        # Score documents based on keyword matching
-        scored_docs = []
-        for doc in self.documents:
-            score = 0
-            content_lower = doc.page_content.lower()
-            title_lower = doc.metadata["title"].lower()
+        indices, confidence = self._retrieve_relevant_indices(query, top_k)
+        return [self.documents[i] for i in indices], confidence
 
-            # Check for relevant keywords
-            keywords = ["electric", "electrical", "shock", "power", "voltage", "wire",
-                       "loto", "lockout", "tagout", "arc", "flash", "ground", "gfci",
-                       "circuit", "energize", "de-energize"]
+    def _retrieve_relevant_indices(self, query: str, top_k: int = 3) -> tuple[List[int], float]:
+        """Keyword-based retrieval returning positions in self.documents.
 
-            for keyword in keywords:
-                if keyword in query_lower:
-                    if keyword in content_lower:
-                        score += 2
-                    if keyword in title_lower:
-                        score += 3
-
-            # Boost score for exact phrase matches
-            if any(word in content_lower for word in query_lower.split()):
-                score += 1
+        Args:
+            query: User query
+            top_k: Number of documents to retrieve
 
-            scored_docs.append((score, doc))
+        Returns:
+            Tuple of (List of relevant document indices, confidence score)
+        """
+        query_lower = query.lower()
 
-        # Sort by score and return top_k
-        scored_docs.sort(reverse=True, key=lambda x: x[0])
+        # Score documents based on keyword matching
+        scores = [0] * len(self.documents)
+        for keyword in self.KEYWORDS:
+            if keyword in query_lower:
+                content_hits, title_hits = self._keyword_index[keyword]
+                for i in content_hits:
+                    scores[i] += 2
+                for i in title_hits:
+                    scores[i] += 3
+
+        # Boost score for exact phrase matches
+        query_words = query_lower.split()
+        for i, content_lower in enumerate(self._content_lower):
+            if any(word in content_lower for word in query_words):
+                scores[i] += 1
+
+        # Select the top_k by score (at least one, for the confidence below)
+        ranked = heapq.nlargest(max(top_k, 1), range(len(scores)), key=scores.__getitem__)
 
         # Calculate confidence based on top score
-        max_score = scored_docs[0][0] if scored_docs else 0
+        max_score = scores[ranked[0]] if ranked else 0
         confidence = min(max_score / 10.0, 1.0)  # Normalize to 0-1
 
-        relevant_docs = [doc for score, doc in scored_docs[:top_k] if score > 0]
-        if not relevant_docs:
-            relevant_docs = self.documents[:top_k]
+        relevant = [i for i in ranked[:top_k] if scores[i] > 0]
+        if not relevant:
+            relevant = list(range(min(top_k, len(self.documents))))
             confidence = 0.1  # Low confidence for fallback
 
-        return relevant_docs, confidence
+        return relevant, confidence
 
     async def process(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process an electrical hazard query.
@@ -101,7 +146,7 @@ class ElectricalHazardSkill:
         import urllib.parse
 
         # Retrieve relevant documents with confidence score
-        relevant_docs, confidence = self._retrieve_relevant_docs(query)
+        relevant_indices, confidence = self._retrieve_relevant_indices(query)
 
         # If confidence is too low, return Google search link
         if confidence < 0.15:  # Lowered threshold
@@ -117,50 +162,25 @@ class ElectricalHazardSkill:
                 "google_link": google_link
             }
 
-        # Build context from documents
-        doc_context = "\n\n".join([
-            f"**{doc.metadata['title']}**\n{doc.page_content}"
-            for doc in relevant_docs
-        ])
-
-        # Create prompt with SMS constraints
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a corporate safety expert specializing in electrical hazards and safety.
-Your role is to provide accurate, practical safety advice based on OSHA standards and NFPA 70E guidelines.
-
-Use the following knowledge base to answer questions:
-
-{context}
-
-CRITICAL CONSTRAINTS:
-- Keep response under 1500 characters (SMS-ready)
-- Be clear, direct, and concise
-- Use bullet points for readability
-- Only answer based on the knowledge base provided
-- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
-- Reference specific regulations when applicable (OSHA 1910.333, NFPA 70E)
-- Emphasize lockout/tagout and de-energization
-- Prioritize worker safety"""),
-            ("human", "{query}")
-        ])
+        # Build context from the preformatted documents
+        doc_context = "\n\n".join([self._doc_formatted[i] for i in relevant_indices])
 
         # Generate response
-        chain = prompt | self.llm
-        response = await chain.ainvoke({
+        response = await self._chain.ainvoke({
             "context": doc_context,
             "query": query
         })
 
         answer = response.content
 
-        # Enforce 1500 character limit
+        # Enforce 1500 character limit (the token cap is only approximate)
         if len(answer) > 1500:
             answer = answer[:1497] + "..."
 
         return {
             "answer": answer,
             "skill": self.name,
-            "sources": [doc.metadata["title"] for doc in relevant_docs],
+            "sources": [self.documents[i].metadata["title"] for i in relevant_indices],
             "category": "electrical_hazard",
             "confidence": confidence
         }
@@ -1,21 +1,38 @@
 """Fall Hazard Detection and Prevention Skill."""
 
-import sys
-import os
-from typing import Dict, Any, List
-from langchain_anthropic import ChatAnthropic
+import heapq
+from typing import Dict, Any, List, Tuple, TYPE_CHECKING
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 
-# Add parent directory to path for knowledge_base import
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from knowledge_base import load_knowledge_base
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+from .documents import load_documents
 
 
 class FallHazardSkill:
     """Skill for handling fall hazard queries."""
 
-    def __init__(self, llm: ChatAnthropic):
+    # Generation cap for answers, a little above the 1500-character SMS limit
+    # (~4 characters per token) so the model isn't billed for text that gets cut
+    MAX_RESPONSE_TOKENS = 450
+
+    # Retrieval keywords; a document gains points for each one it shares with the query
+    KEYWORDS = ["fall", "fell", "fallen", "height", "ladder", "scaffold", "protection", "harness",
+                "guardrail", "edge", "roof", "elevated", "injury", "injur", "emergency",
+                "first aid", "response", "incident", "victim", "medical", "911", "call",
+                "help", "hospital", "immediate", "urgent"]
+
+    # Emergency/injury phrases that earn a larger boost when query and document share them
+    EMERGENCY_PHRASES = ["what should i do", "what do i do", "fell from", "injured",
+                         "emergency response", "first aid"]
+
+    # Query words whose document hits are remembered; free-form words can't be
+    # indexed up front, but the vocabulary of questions repeats
+    WORD_CACHE_SIZE = 4096
+
+    def __init__(self, llm: "ChatAnthropic"):
         """Initialize the fall hazard skill.
 
         Args:
@@ -25,17 +42,69 @@ class FallHazardSkill:
         self.name = "Fall Hazard"
         self.description = "Handles questions about fall hazards, working at heights, ladders, scaffolding, and fall protection"
 
-        # Load knowledge base from centralized knowledge_base folder
-        full_kb = load_knowledge_base("fall")
+        # Load knowledge base documents from centralized knowledge_base folder
+        # (shared with other instances of this skill)
+        self.documents = list(load_documents("fall"))
+
+        # Lowercased text and, per keyword and phrase, the documents whose content
+        # and title contain it, so queries don't rescan the knowledge base per keyword
+        self._content_lower = [doc.page_content.lower() for doc in self.documents]
+        self._title_lower = [doc.metadata["title"].lower() for doc in self.documents]
+        self._keyword_index = {
+            keyword: (
+                [i for i, content in enumerate(self._content_lower) if keyword in content],
+                [i for i, title in enumerate(self._title_lower) if keyword in title]
+            )
+            for keyword in self.KEYWORDS
+        }
+        self._word_hits: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._phrase_index = {
+            phrase: [i for i, content in enumerate(self._content_lower) if phrase in content]
+            for phrase in self.EMERGENCY_PHRASES
+        }
+
+        # Create prompt with SMS constraints
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a corporate safety expert specializing in fall hazards and prevention.
+Your role is to provide accurate, practical safety advice based on OSHA standards and best practices.
+
+Use the following knowledge base to answer questions:
+
+{context}
+
+CRITICAL CONSTRAINTS:
+- Keep response under 1500 characters (SMS-ready)
+- Be clear, direct, and concise
+- Use bullet points for readability
+- Only answer based on the knowledge base provided
+- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
+- Reference specific regulations when applicable
+- Prioritize worker safety"""),
+            ("human", "{query}")
+        ])
+
+        self._chain = prompt | self.llm.bind(max_tokens=self.MAX_RESPONSE_TOKENS)
 
-        # Convert knowledge base to documents
-        self.documents = [
-            Document(
-                page_content=item["content"],
-                metadata={"title": item["title"], "category": item["category"]}
+    def _get_word_hits(self, word: str) -> Tuple[List[int], List[int]]:
+        """Find the documents whose content and title contain a query word.
+
+        Args:
+            word: Lowercased query word
+
+        Returns:
+            Tuple of (content hit indices, title hit indices)
+        """
+        # Re-insert as most recent, evicting the oldest word when full
+        hits = self._word_hits.pop(word, None)
+        if hits is None:
+            hits = (
+                [i for i, content in enumerate(self._content_lower) if word in content],
+                [i for i, title in enumerate(self._title_lower) if word in title]
             )
-            for item in full_kb
-        ]
+        self._word_hits[word] = hits
+        if len(self._word_hits) > self.WORD_CACHE_SIZE:
+            self._word_hits.pop(next(iter(self._word_hits)), None)
+        return hits
 
     def _retrieve_relevant_docs(self, query: str, top_k: int = 3) -> tuple[List[Document], float]:
         """Simple keyword-based retrieval of relevant documents.
@@ -50,48 +119,35 @@ class FallHazardSkill:
         query_lower = query.lower()
 
         # Score documents based on keyword matching
-        scored_docs = []
-        for doc in self.documents:
-            score = 0
-            content_lower = doc.page_content.lower()
-            title_lower = doc.metadata["title"].lower()
-
-            # Check for relevant keywords
-            keywords = ["fall", "fell", "fallen", "height", "ladder", "scaffold", "protection", "harness",
-                       "guardrail", "edge", "roof", "elevated", "injury", "injur", "emergency",
-                       "first aid", "response", "incident", "victim", "medical", "911", "call",
-                       "help", "hospital", "immediate", "urgent"]
-
-            for keyword in keywords:
-                if keyword in query_lower:
-                    if keyword in content_lower:
-                        score += 2
-                    if keyword in title_lower:
-                        score += 3
-
-            # Special boost for emergency/injury phrases
-            emergency_phrases = ["what should i do", "what do i do", "fell from", "injured",
-                               "emergency response", "first aid"]
-            for phrase in emergency_phrases:
-                if phrase in query_lower and phrase in content_lower:
-                    score += 4
-
-            # Boost score for word matches (individual words)
-            query_words = [w for w in query_lower.split() if len(w) > 3]  # Skip short words
-            for word in query_words:
-                if word in content_lower:
-                    score += 1
-
-            scored_docs.append((score, doc))
-
-        # Sort by score and return top_k
-        scored_docs.sort(reverse=True, key=lambda x: x[0])
+        scores = [0] * len(self.documents)
+        for keyword in self.KEYWORDS:
+            if keyword in query_lower:
+                content_hits, title_hits = self._keyword_index[keyword]
+                for i in content_hits:
+                    scores[i] += 2
+                for i in title_hits:
+                    scores[i] += 3
+
+        # Special boost for emergency/injury phrases
+        for phrase in self.EMERGENCY_PHRASES:
+            if phrase in query_lower:
+                for i in self._phrase_index[phrase]:
+                    scores[i] += 4
+
+        # Boost score for word matches (individual words)
+        query_words = [w for w in query_lower.split() if len(w) > 3]  # Skip short words
+        for word in query_words:
+            for i in self._get_word_hits(word)[0]:
+                scores[i] += 1
+
+        # Select the top_k by score (at least one, for the confidence below)
+        ranked = heapq.nlargest(max(top_k, 1), range(len(scores)), key=scores.__getitem__)
 
         # Calculate confidence based on top score
-        max_score = scored_docs[0][0] if scored_docs else 0
+        max_score = scores[ranked[0]] if ranked else 0
         confidence = min(max_score / 8.0, 1.0)  # Normalize to 0-1 (more lenient: 2.4 = 0.3 threshold)
 
-        relevant_docs = [doc for score, doc in scored_docs[:top_k] if score > 0]
+        relevant_docs = [self.documents[i] for i in ranked[:top_k] if scores[i] > 0]
         if not relevant_docs:
             relevant_docs = self.documents[:top_k]
             confidence = 0.15  # Low confidence for fallback
@@ -133,36 +189,15 @@ class FallHazardSkill:
             for doc in relevant_docs
         ])
 
-        # Create prompt with SMS constraints
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a corporate safety expert specializing in fall hazards and prevention.
-Your role is to provide accurate, practical safety advice based on OSHA standards and best practices.
-
-Use the following knowledge base to answer questions:
-
-{context}
-
-CRITICAL CONSTRAINTS:
-- Keep response under 1500 characters (SMS-ready)
-- Be clear, direct, and concise
-- Use bullet points for readability
-- Only answer based on the knowledge base provided
-- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
-- Reference specific regulations when applicable
-- Prioritize worker safety"""),
-            ("human", "{query}")
-        ])
-
         # Generate response
-        chain = prompt | self.llm
-        response = await chain.ainvoke({
+        response = await self._chain.ainvoke({
             "context": doc_context,
             "query": query
         })
 
         answer = response.content
 
-        # Enforce 1500 character limit
+        # Enforce 1500 character limit (the token cap is only approximate)
         if len(answer) > 1500:
             answer = answer[:1497] + "..."
 
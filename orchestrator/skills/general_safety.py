@@ -1,21 +1,74 @@
 """General Safety Skill for topics not covered by specific hazard skills."""
 
-import sys
-import os
-from typing import Dict, Any, List
-from langchain_anthropic import ChatAnthropic
+import heapq
+from typing import Dict, Any, List, Tuple, TYPE_CHECKING
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 
-# Add parent directory to path for knowledge_base import
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from knowledge_base import load_knowledge_base
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+from .documents import load_documents
 
 
 class GeneralSafetySkill:
     """Skill for handling general workplace safety queries."""
 
-    def __init__(self, llm: ChatAnthropic):
+    # Generation cap for answers, a little above the 1500-character SMS limit
+    # (~4 characters per token) so the model isn't billed for text that gets cut
+    MAX_RESPONSE_TOKENS = 450
+
+    # Retrieval keywords; a document gains points for each one it shares with the
+    # query (repeated entries count once per listing)
+    KEYWORDS = [
+        # PPE and Equipment
+        "ppe", "safety", "equipment", "protection", "protective", "gear",
+        "hard hat", "helmet", "glasses", "goggles", "gloves", "boots",
+        "respirator", "mask", "vest", "harness",
+
+        # General Safety
+        "hazard", "dangerous", "risk", "unsafe", "warning", "caution",
+        "safety", "safe", "secure", "emergency", "urgent",
+
+        # Injuries and First Aid
+        "injury", "injured", "hurt", "wound", "wounded", "bleeding", "blood",
+        "cut", "laceration", "burn", "burned", "bruise", "sprain", "fracture",
+        "broken", "pain", "ache", "sick", "ill", "medical", "doctor", "hospital",
+        "first aid", "treatment", "care", "bandage", "splint",
+
+        # Emergency Response
+        "emergency", "accident", "incident", "crash", "collision", "help",
+        "ambulance", "911", "call", "report", "evacuate", "evacuation",
+
+        # Site and Entry
+        "site", "enter", "entry", "arrive", "new", "first day", "orientation",
+        "induction", "training", "safety briefing", "sign in",
+
+        # Environmental Hazards
+        "fire", "smoke", "flame", "burning", "chemical", "smell", "odor",
+        "gas", "fumes", "vapor", "toxic", "poison", "spill", "leak",
+        "suspicious", "unknown", "strange", "unusual",
+
+        # Physical Hazards
+        "fall", "trip", "slip", "stumble", "height", "edge", "hole", "opening",
+        "electric", "shock", "power", "wire", "cable", "exposed",
+        "struck", "hit", "crush", "caught", "pinch", "trap",
+
+        # Specific Topics
+        "ergonomic", "lifting", "manual handling", "repetitive", "strain",
+        "confined space", "permit", "entry", "enclosed",
+        "heat", "hot", "cold", "freeze", "temperature", "weather",
+        "violence", "assault", "threat", "aggression",
+        "respiratory", "breathing", "air", "oxygen", "ventilation",
+        "machine", "equipment", "tool", "guard", "shield",
+        "ladder", "scaffold", "platform", "roof"
+    ]
+
+    # Query words whose document hits are remembered; free-form words can't be
+    # indexed up front, but the vocabulary of questions repeats
+    WORD_CACHE_SIZE = 4096
+
+    def __init__(self, llm: "ChatAnthropic"):
         """Initialize the general safety skill.
 
         Args:
@@ -25,17 +78,65 @@ class GeneralSafetySkill:
         self.name = "General Safety"
         self.description = "Handles general workplace safety questions including PPE, fire safety, hazard communication, ergonomics, and other safety topics"
 
-        # Load knowledge base from centralized knowledge_base folder
-        full_kb = load_knowledge_base("general")
+        # Load knowledge base documents from centralized knowledge_base folder
+        # (shared with other instances of this skill)
+        self.documents = list(load_documents("general"))
+
+        # Lowercased text and, per keyword, the documents whose content and
+        # title contain it, so queries don't rescan the knowledge base per keyword
+        self._content_lower = [doc.page_content.lower() for doc in self.documents]
+        self._title_lower = [doc.metadata["title"].lower() for doc in self.documents]
+        self._keyword_index = {
+            keyword: (
+                [i for i, content in enumerate(self._content_lower) if keyword in content],
+                [i for i, title in enumerate(self._title_lower) if keyword in title]
+            )
+            for keyword in self.KEYWORDS
+        }
+        self._word_hits: Dict[str, Tuple[List[int], List[int]]] = {}
+
+        # Create prompt with SMS constraints
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a corporate safety expert specializing in general workplace safety.
+Your role is to provide accurate, practical safety advice based on OSHA standards and best practices.
+
+Use the following knowledge base to answer questions:
+
+{context}
+
+CRITICAL CONSTRAINTS:
+- Keep response under 1500 characters (SMS-ready)
+- Be clear, direct, and concise
+- Use bullet points for readability
+- Only answer based on the knowledge base provided
+- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
+- Reference specific regulations when applicable
+- Prioritize worker safety"""),
+            ("human", "{query}")
+        ])
+
+        self._chain = prompt | self.llm.bind(max_tokens=self.MAX_RESPONSE_TOKENS)
+
+    def _get_word_hits(self, word: str) -> Tuple[List[int], List[int]]:
+        """Find the documents whose content and title contain a query word.
 
-        # Convert knowledge base to documents
-        self.documents = [
-            Document(
-                page_content=item["content"],
-                metadata={"title": item["title"], "category": item["category"]}
+        Args:
+            word: Lowercased query word
+
+        Returns:
+            Tuple of (content hit indices, title hit indices)
+        """
+        # Re-insert as most recent, evicting the oldest word when full
+        hits = self._word_hits.pop(word, None)
+        if hits is None:
+            hits = (
+                [i for i, content in enumerate(self._content_lower) if word in content],
+                [i for i, title in enumerate(self._title_lower) if word in title]
             )
-            for item in full_kb
-        ]
+        self._word_hits[word] = hits
+        if len(self._word_hits) > self.WORD_CACHE_SIZE:
+            self._word_hits.pop(next(iter(self._word_hits)), None)
+        return hits
 
     def _retrieve_relevant_docs(self, query: str, top_k: int = 3) -> tuple[List[Document], float]:
         """Simple keyword-based retrieval of relevant documents.
@@ -50,83 +151,32 @@ class GeneralSafetySkill:
         query_lower = query.lower()
 
         # Score documents based on keyword matching
-        scored_docs = []
-        for doc in self.documents:
-            score = 0
-            content_lower = doc.page_content.lower()
-            title_lower = doc.metadata["title"].lower()
-
-            # Check for relevant keywords - EXPANDED LIST
-            keywords = [
-                # PPE and Equipment
-                "ppe", "safety", "equipment", "protection", "protective", "gear",
-                "hard hat", "helmet", "glasses", "goggles", "gloves", "boots",
-                "respirator", "mask", "vest", "harness",
-
-                # General Safety
-                "hazard", "dangerous", "risk", "unsafe", "warning", "caution",
-                "safety", "safe", "secure", "emergency", "urgent",
-
-                # Injuries and First Aid
-                "injury", "injured", "hurt", "wound", "wounded", "bleeding", "blood",
-                "cut", "laceration", "burn", "burned", "bruise", "sprain", "fracture",
-                "broken", "pain", "ache", "sick", "ill", "medical", "doctor", "hospital",
-                "first aid", "treatment", "care", "bandage", "splint",
-
-                # Emergency Response
-                "emergency", "accident", "incident", "crash", "collision", "help",
-                "ambulance", "911", "call", "report", "evacuate", "evacuation",
-
-                # Site and Entry
-                "site", "enter", "entry", "arrive", "new", "first day", "orientation",
-                "induction", "training", "safety briefing", "sign in",
-
-                # Environmental Hazards
-                "fire", "smoke", "flame", "burning", "chemical", "smell", "odor",
-                "gas", "fumes", "vapor", "toxic", "poison", "spill", "leak",
-                "suspicious", "unknown", "strange", "unusual",
-
-                # Physical Hazards
-                "fall", "trip", "slip", "stumble", "height", "edge", "hole", "opening",
-                "electric", "shock", "power", "wire", "cable", "exposed",
-                "struck", "hit", "crush", "caught", "pinch", "trap",
-
-                # Specific Topics
-                "ergonomic", "lifting", "manual handling", "repetitive", "strain",
-                "confined space", "permit", "entry", "enclosed",
-                "heat", "hot", "cold", "freeze", "temperature", "weather",
-                "violence", "assault", "threat", "aggression",
-                "respiratory", "breathing", "air", "oxygen", "ventilation",
-                "machine", "equipment", "tool", "guard", "shield",
-                "ladder", "scaffold", "platform", "roof"
-            ]
-
-            # Score based on keyword matches
-            for keyword in keywords:
-                if keyword in query_lower:
-                    if keyword in content_lower:
-                        score += 2
-                    if keyword in title_lower:
-                        score += 4  # Increased from 3
-
-            # Boost score for query word matches in content
-            query_words = [w for w in query_lower.split() if len(w) > 3]  # Skip short words
-            for word in query_words:
-                if word in content_lower:
-                    score += 1
-                if word in title_lower:
-                    score += 2
-
-            scored_docs.append((score, doc))
-
-        # Sort by score and return top_k
-        scored_docs.sort(reverse=True, key=lambda x: x[0])
+        scores = [0] * len(self.documents)
+        for keyword in self.KEYWORDS:
+            if keyword in query_lower:
+                content_hits, title_hits = self._keyword_index[keyword]
+                for i in content_hits:
+                    scores[i] += 2
+                for i in title_hits:
+                    scores[i] += 4  # Increased from 3
+
+        # Boost score for query word matches in content
+        query_words = [w for w in query_lower.split() if len(w) > 3]  # Skip short words
+        for word in query_words:
+            content_hits, title_hits = self._get_word_hits(word)
+            for i in content_hits:
+                scores[i] += 1
+            for i in title_hits:
+                scores[i] += 2
+
+        # Select the top_k by score (at least one, for the confidence below)
+        ranked = heapq.nlargest(max(top_k, 1), range(len(scores)), key=scores.__getitem__)
 
         # Calculate confidence based on top score - MORE GENEROUS
-        max_score = scored_docs[0][0] if scored_docs else 0
+        max_score = scores[ranked[0]] if ranked else 0
         confidence = min(max_score / 6.0, 1.0)  # Changed from 10.0 to 6.0 for higher confidence
 
-        relevant_docs = [doc for score, doc in scored_docs[:top_k] if score > 0]
+        relevant_docs = [self.documents[i] for i in ranked[:top_k] if scores[i] > 0]
         if not relevant_docs:
             relevant_docs = self.documents[:top_k]
             confidence = 0.2  # Increased from 0.1 to give fallback docs a chance
@@ -168,36 +218,15 @@ class GeneralSafetySkill:
             for doc in relevant_docs
         ])
 
-        # Create prompt with SMS constraints
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a corporate safety expert specializing in general workplace safety.
-Your role is to provide accurate, practical safety advice based on OSHA standards and best practices.
-
-Use the following knowledge base to answer questions:
-
-{context}
-
-CRITICAL CONSTRAINTS:
-- Keep response under 1500 characters (SMS-ready)
-- Be clear, direct, and concise
-- Use bullet points for readability
-- Only answer based on the knowledge base provided
-- If the knowledge base doesn't cover the question, say "I don't have specific information on this"
-- Reference specific regulations when applicable
-- Prioritize worker safety"""),
-            ("human", "{query}")
-        ])
-
         # Generate response
-        chain = prompt | self.llm
-        response = await chain.ainvoke({
+        response = await self._chain.ainvoke({
             "context": doc_context,
             "query": query
         })
 
         answer = response.content
 
-        # Enforce 1500 character limit
+        # Enforce 1500 character limit (the token cap is only approximate)
         if len(answer) > 1500:
             answer = answer[:1497] + "..."
 
@@ -237,8 +237,8 @@ def main():
         if uploaded_file:
             if st.button("Process Document", type="primary", use_container_width=True):
                 # Check if document was already imported
-                from orchestrator.knowledge_base_manager import KnowledgeBaseManager
-                kb_manager = KnowledgeBaseManager()
+                from orchestrator.knowledge_base_manager import get_knowledge_base_manager
+                kb_manager = get_knowledge_base_manager()
 
                 if kb_manager.is_document_imported(uploaded_file.name):
                     st.warning(f"⏭️  Document '{uploaded_file.name}' has already been imported!")
@@ -269,7 +269,7 @@ def main():
                             api_key = os.getenv(provider_info.get('env_var', 'API_KEY'))
                             llm = get_llm(provider=provider_option, api_key=api_key, temperature=0)
                             categorizer = PDFCategorizer(llm)
-                            categorized_chunks = categorizer.categorize_chunks(chunks, llm)
+                            categorized_chunks = categorizer.categorize_chunks_sync(chunks)
 
                             # Create knowledge_base directory if it doesn't exist
                             kb_dir = "knowledge_base"
@@ -416,18 +416,28 @@ def main():
 
     # Process question
     if submit_button and question.strip():
-        with st.spinner("🤔 Processing your question..."):
-            try:
-                result = st.session_state.agent.ask(question)
-
-                # Add to chat history
-                st.session_state.chat_history.append({
-                    'question': question,
-                    'result': result
-                })
-
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+        agent = st.session_state.agent
+        try:
+            if isinstance(agent, ClaudeSkillsProvider):
+                # Show the answer as it streams; the finished answer is cached,
+                # so ask() then returns the full result without another API call
+                live_answer = st.empty()
+                with live_answer.container():
+                    st.write_stream(agent.ask_stream(question))
+                result = agent.ask(question)
+                live_answer.empty()  # The history below shows the answer from here on
+            else:
+                with st.spinner("🤔 Processing your question..."):
+                    result = agent.ask(question)
+
+            # Add to chat history
+            st.session_state.chat_history.append({
+                'question': question,
+                'result': result
+            })
+
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
 
     # Compare modes side-by-side
     if compare_button and question.strip():
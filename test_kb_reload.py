@@ -0,0 +1,87 @@
+"""Test script to verify knowledge base loads pick up appended entries."""
+
+import os
+import shutil
+import tempfile
+
+import knowledge_base
+from knowledge_base import load_knowledge_base
+from orchestrator.knowledge_base_manager import KnowledgeBaseManager
+from orchestrator.skills.documents import load_documents
+
+
+def test_append_then_reload():
+    """Entries appended through the KB manager are returned by the next load."""
+    kb_dir = tempfile.mkdtemp()
+    original_paths = knowledge_base.KB_DIR, knowledge_base.BLOB_FILE
+    knowledge_base.KB_DIR = kb_dir
+    knowledge_base.BLOB_FILE = os.path.join(kb_dir, "kb.msgpack")
+    try:
+        kb_manager = KnowledgeBaseManager(kb_dir)
+        kb_manager.save_knowledge_base("fall", [{
+            "title": "Guardrails",
+            "content": "Guardrails must be installed along every unprotected edge above six feet.",
+            "category": "fall"
+        }])
+
+        before = load_knowledge_base("fall")
+        assert load_knowledge_base("fall") is before, "unchanged file should be served from the memo"
+        documents_before = load_documents("fall")
+        assert load_documents("fall") is documents_before, "unchanged file should reuse the documents"
+
+        kb_manager.append_to_knowledge_base("fall", [{
+            "title": "Ladder Inspection",
+            "content": "Inspect every portable ladder for cracked rails and missing rungs before each shift.",
+            "category": "fall"
+        }])
+
+        after = load_knowledge_base("fall")
+        assert [e["title"] for e in after] == ["Guardrails", "Ladder Inspection"], after
+        documents_after = load_documents("fall")
+        assert [d.metadata["title"] for d in documents_after] == ["Guardrails", "Ladder Inspection"], documents_after
+        print("✅ PASS: append followed by reload returns the new entries")
+    finally:
+        knowledge_base.KB_DIR, knowledge_base.BLOB_FILE = original_paths
+        shutil.rmtree(kb_dir)
+
+
+def test_append_after_blob_load():
+    """JSON edits made after the blob was loaded take precedence over it."""
+    if knowledge_base.msgpack is None:
+        print("⏭️  SKIP: msgpack is not installed")
+        return
+
+    kb_dir = tempfile.mkdtemp()
+    original_paths = knowledge_base.KB_DIR, knowledge_base.BLOB_FILE
+    knowledge_base.KB_DIR = kb_dir
+    knowledge_base.BLOB_FILE = os.path.join(kb_dir, "kb.msgpack")
+    try:
+        kb_manager = KnowledgeBaseManager(kb_dir)
+        entries = [{
+            "title": "Guardrails",
+            "content": "Guardrails must be installed along every unprotected edge above six feet.",
+            "category": "fall"
+        }]
+        kb_manager.save_knowledge_base("fall", entries)
+        with open(knowledge_base.BLOB_FILE, "wb") as f:
+            f.write(knowledge_base.msgpack.packb({"fall": entries}, use_bin_type=True))
+
+        assert load_knowledge_base("fall") is knowledge_base._load_blob()["fall"], "current blob should be used"
+
+        kb_manager.append_to_knowledge_base("fall", [{
+            "title": "Ladder Inspection",
+            "content": "Inspect every portable ladder for cracked rails and missing rungs before each shift.",
+            "category": "fall"
+        }])
+
+        after = load_knowledge_base("fall")
+        assert [e["title"] for e in after] == ["Guardrails", "Ladder Inspection"], after
+        print("✅ PASS: JSON append after a blob load is returned by the next load")
+    finally:
+        knowledge_base.KB_DIR, knowledge_base.BLOB_FILE = original_paths
+        shutil.rmtree(kb_dir)
+
+
+if __name__ == "__main__":
+    test_append_then_reload()
+    test_append_after_blob_load()